@@ -8,9 +8,16 @@ from database import get_session, engine
 from datetime import datetime
 import json
 import os
+import threading
 
 Base = declarative_base()
 
+# Cache marker for keys that have no row, so misses are cached too
+_MISSING = object()
+
+# Shown in place of sensitive values; the admin UI posts it back unchanged
+MASKED_VALUE = '********'
+
 
 class SystemConfig(Base):
     """System configuration settings"""
@@ -131,10 +138,21 @@ class ConfigManager:
     }
     
     def __init__(self):
-        self.session = get_session()
+        # In-process read cache, cleared by invalidate() on every write
+        self._cache = {}
+        self._all_snapshot = None
+        self._values_snapshot = None
+        self._cache_lock = threading.Lock()
+        self.version = 0  # Bumped on every invalidate()
+        
         self._ensure_table_exists()
         self._initialize_defaults()
     
+    @property
+    def session(self):
+        """Session for the calling thread, so one instance can be shared across requests"""
+        return get_session()
+    
     def _ensure_table_exists(self):
         """Create config table if it doesn't exist"""
         try:
@@ -166,12 +184,56 @@ class ConfigManager:
             self.session.rollback()
             print(f"Error initializing config: {e}")
     
+    def invalidate(self):
+        """Drop cached values so the next reads come from the database"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._all_snapshot = None
+            self._values_snapshot = None
+            self.version += 1
+    
     def get(self, key, default=None):
         """Get configuration value"""
-        config = self.session.query(SystemConfig).filter_by(key=key).first()
-        if config:
-            return config.value
-        return default
+        try:
+            value = self._cache[key]
+        except KeyError:
+            version = self.version
+            config = self.session.query(SystemConfig).filter_by(key=key).first()
+            value = config.value if config else _MISSING
+            with self._cache_lock:
+                # Don't cache a value read before a concurrent write
+                if self.version == version:
+                    self._cache[key] = value
+        if value is _MISSING:
+            return default
+        return value
+    
+    def get_many(self, keys):
+        """Get several configuration values with at most one query.
+        
+        Returns a dict of key -> value for the keys that exist.
+        """
+        values = {}
+        uncached = []
+        for key in keys:
+            if key in self._cache:
+                values[key] = self._cache[key]
+            else:
+                uncached.append(key)
+        
+        if uncached:
+            version = self.version
+            rows = self.session.query(SystemConfig.key, SystemConfig.value).filter(
+                SystemConfig.key.in_(uncached)
+            ).all()
+            fetched = dict.fromkeys(uncached, _MISSING)
+            fetched.update(rows)
+            with self._cache_lock:
+                if self.version == version:
+                    self._cache.update(fetched)
+            values.update(fetched)
+        
+        return {key: value for key, value in values.items() if value is not _MISSING}
     
     def get_int(self, key, default=0):
         """Get configuration value as integer"""
@@ -211,17 +273,44 @@ class ConfigManager:
             self.session.rollback()
             print(f"Error setting config {key}: {e}")
             return False
+        finally:
+            self.invalidate()
     
     def get_all(self, category=None):
         """Get all configuration values, optionally filtered by category"""
-        query = self.session.query(SystemConfig)
-        if category:
-            query = query.filter_by(category=category)
+        configs = self._all_snapshot
+        if configs is None:
+            version = self.version
+            configs = self._load_all()
+            with self._cache_lock:
+                if self.version == version:
+                    self._all_snapshot = configs
         
-        configs = query.all()
+        if category:
+            configs = [c for c in configs if c['category'] == category]
+        # Copy so callers can't modify the cached entries
+        return [dict(c) for c in configs]
+    
+    def get_values(self):
+        """Get all configuration values as a key -> value dict, sensitive values masked"""
+        values = self._values_snapshot
+        if values is None:
+            version = self.version
+            rows = self.session.query(
+                SystemConfig.key, SystemConfig.value, SystemConfig.is_sensitive
+            ).all()
+            values = {key: MASKED_VALUE if sensitive else value for key, value, sensitive in rows}
+            with self._cache_lock:
+                if self.version == version:
+                    self._values_snapshot = values
+        return dict(values)
+    
+    def _load_all(self):
+        """Query every configuration row as a list of dicts"""
+        configs = self.session.query(SystemConfig).all()
         return [{
             'key': c.key,
-            'value': '********' if c.is_sensitive else c.value,
+            'value': MASKED_VALUE if c.is_sensitive else c.value,
             'actual_value': c.value,  # For internal use
             'description': c.description,
             'category': c.category,
@@ -241,22 +330,64 @@ class ConfigManager:
             grouped[category].append(config)
         return grouped
     
+    def changed_values(self, updates):
+        """Subset of updates whose values differ from the stored ones.
+        
+        The masked placeholder sent back for a sensitive key counts as unchanged.
+        """
+        current = self.get_many(list(updates))
+        changed = {}
+        for key, value in updates.items():
+            if key in current and current[key] == str(value):
+                continue
+            if value == MASKED_VALUE and self.DEFAULTS.get(key, {}).get('is_sensitive'):
+                continue
+            changed[key] = value
+        return changed
+    
     def update_multiple(self, updates, updated_by='admin'):
-        """Update multiple configuration values at once"""
-        success_count = 0
-        errors = []
+        """Update multiple configuration values at once, in a single transaction"""
+        if not updates:
+            return {'success': 0, 'errors': [], 'total': 0}
+        
+        existing = {
+            c.key: c for c in self.session.query(SystemConfig).filter(
+                SystemConfig.key.in_(list(updates))
+            )
+        }
+        now = datetime.utcnow()
         
         for key, value in updates.items():
-            if self.set(key, value, updated_by):
-                success_count += 1
+            config = existing.get(key)
+            if config:
+                config.value = str(value)
+                config.updated_at = now
+                config.updated_by = updated_by
             else:
-                errors.append(key)
+                # Create new config entry
+                self.session.add(SystemConfig(
+                    key=key,
+                    value=str(value),
+                    updated_by=updated_by
+                ))
         
-        return {
-            'success': success_count,
-            'errors': errors,
-            'total': len(updates)
-        }
+        try:
+            self.session.commit()
+            return {
+                'success': len(updates),
+                'errors': [],
+                'total': len(updates)
+            }
+        except Exception as e:
+            self.session.rollback()
+            print(f"Error updating config: {e}")
+            return {
+                'success': 0,
+                'errors': list(updates),
+                'total': len(updates)
+            }
+        finally:
+            self.invalidate()
     
     def reset_to_defaults(self, category=None):
         """Reset configuration to default values"""
@@ -265,8 +396,10 @@ class ConfigManager:
             defaults_to_reset = {k: v for k, v in self.DEFAULTS.items() 
                                if v['category'] == category}
         
-        for key, config in defaults_to_reset.items():
-            self.set(key, config['value'], 'system')
+        self.update_multiple(
+            {key: config['value'] for key, config in defaults_to_reset.items()},
+            'system'
+        )
         
         return len(defaults_to_reset)
     
@@ -302,12 +435,18 @@ class ConfigManager:
 
 # Singleton instance
 _config_manager = None
+_config_manager_lock = threading.Lock()
 
 def get_config_manager():
     """Get or create ConfigManager singleton"""
     global _config_manager
-    if _config_manager is None:
-        _config_manager = ConfigManager()
-    return _config_manager
+    config_mgr = _config_manager
+    if config_mgr is None:
+        with _config_manager_lock:
+            # Only one thread creates the tables and default rows
+            if _config_manager is None:
+                _config_manager = ConfigManager()
+            config_mgr = _config_manager
+    return config_mgr
 
 # Made with Bob
@@ -43,8 +43,9 @@ if DATABASE_URL.startswith('postgresql'):
         DATABASE_URL,
         echo=False,
         pool_pre_ping=True,  # Verify connections before using them
-        pool_size=10,
-        max_overflow=20
+        pool_size=20,  # Persistent connections kept open for request threads
+        max_overflow=10,  # Extra connections allowed under burst load
+        pool_recycle=3600  # Replace connections before server-side idle timeouts
     )
     print(f"Using PostgreSQL database")
 else:
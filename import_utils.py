@@ -86,10 +86,13 @@ def normalize_gender(value):
         
     return val # Return original if not matched (e.g. 'X')
 
-def import_participants_from_excel(file_path, race_id=None):
+def import_participants_from_excel(excel_file, race_id=None):
     """
     Import participants from an Excel file
     
+    excel_file may be a path or a binary file-like object (e.g. an uploaded
+    file's stream), so uploads can be read without writing them to disk first.
+    
     Automatically maps various header formats to expected fields.
     If race_id is provided and bib numbers are in the file, participants are registered.
     If race_id is provided but no bib numbers, bibs are auto-assigned.
@@ -98,7 +101,7 @@ def import_participants_from_excel(file_path, race_id=None):
     
     try:
         # Read Excel file
-        df = pd.read_excel(file_path)
+        df = pd.read_excel(excel_file)
         
         # Map headers to standardized field names
         field_map = map_headers(df.columns)
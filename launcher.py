@@ -69,11 +69,10 @@ def _open_browser():
 
 def _run_server():
     """Initialise the database and start the Flask development server."""
-    from database import init_db
-    from web_app import app
+    from web_app import init_app
 
     logger.info('Initialising database …')
-    init_db()
+    app = init_app()
 
     logger.info('Starting Race Timing System on %s', APP_URL)
     # use_reloader=False is required — reloader forks the process which breaks
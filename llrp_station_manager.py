@@ -5,13 +5,16 @@ Manages LLRP RFID reader stations
 from database import get_session
 from models import LLRPStation
 from datetime import datetime
+from sqlalchemy import or_
 
 
 class LLRPStationManager:
     """Manages LLRP station creation and configuration"""
     
-    def __init__(self):
-        self.session = get_session()
+    @property
+    def session(self):
+        """Session for the calling thread, so one instance can be shared across requests"""
+        return get_session()
     
     def create_station(self, name, reader_ip, reader_port=5084, cooldown_seconds=5):
         """Create a new LLRP station"""
@@ -80,14 +83,38 @@ class LLRPStationManager:
         }
     
     def update_station_status(self, station_id, is_active, last_connected=None):
-        """Update station status"""
-        station = self.get_station(station_id)
-        if station:
-            station.is_active = is_active
-            if last_connected:
-                station.last_connected = last_connected
-            elif is_active:
-                station.last_connected = datetime.utcnow()
-            self.session.commit()
-            return True
-        return False
+        """Update station status
+        
+        Marking a station active always records last_connected, since that
+        is the time of the most recent connection even if the row was left
+        active (e.g. after a crash). Marking it inactive is a conditional
+        UPDATE that only matches when is_active actually changes, so
+        repeated stop calls don't rewrite the row. Returns True if a row
+        was updated.
+        """
+        values = {LLRPStation.is_active: is_active}
+        if last_connected:
+            values[LLRPStation.last_connected] = last_connected
+        elif is_active:
+            values[LLRPStation.last_connected] = datetime.utcnow()
+        
+        query = self.session.query(LLRPStation).filter(LLRPStation.id == station_id)
+        if LLRPStation.last_connected not in values:
+            query = query.filter(or_(
+                LLRPStation.is_active.is_(None),
+                LLRPStation.is_active != is_active
+            ))
+        updated = query.update(values)
+        self.session.commit()
+        return updated > 0
+
+
+# Singleton instance
+_llrp_station_manager = None
+
+def get_llrp_station_manager():
+    """Get or create LLRPStationManager singleton"""
+    global _llrp_station_manager
+    if _llrp_station_manager is None:
+        _llrp_station_manager = LLRPStationManager()
+    return _llrp_station_manager
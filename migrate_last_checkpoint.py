@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Add Last Checkpoint Fields
+Adds last_checkpoint_name and last_checkpoint_time to race_results table and
+backfills them from the existing split_times JSON
+"""
+from sqlalchemy import text
+from datetime import datetime
+from database import get_session
+import json
+import sys
+
+
+def check_columns_exist():
+    """Check if the new columns already exist"""
+    session = get_session()
+    try:
+        result = session.execute(text("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name = 'race_results' 
+            AND column_name IN ('last_checkpoint_name', 'last_checkpoint_time')
+        """))
+        existing_columns = [row[0] for row in result]
+        return existing_columns
+    except Exception as e:
+        print(f"Error checking columns: {e}")
+        return []
+    finally:
+        session.close()
+
+
+def backfill(session):
+    """Populate the new columns from split_times; returns the number of rows updated"""
+    rows = session.execute(text("""
+        SELECT id, split_times FROM race_results
+        WHERE split_times IS NOT NULL AND last_checkpoint_name IS NULL
+    """)).fetchall()
+    
+    updated = 0
+    for result_id, split_times in rows:
+        try:
+            splits = json.loads(split_times)
+        except ValueError:
+            continue
+        if not splits:
+            continue
+        
+        # split_times is built in timestamp order, so the last entry is the latest
+        name, timestamp = list(splits.items())[-1]
+        session.execute(text("""
+            UPDATE race_results
+            SET last_checkpoint_name = :name, last_checkpoint_time = :timestamp
+            WHERE id = :id
+        """), {'name': name, 'timestamp': datetime.fromisoformat(timestamp), 'id': result_id})
+        updated += 1
+    
+    return updated
+
+
+def migrate_database():
+    """Add last checkpoint fields to race_results table"""
+    print("=" * 60)
+    print("Last Checkpoint Migration")
+    print("=" * 60)
+    
+    existing = check_columns_exist()
+    
+    session = get_session()
+    
+    try:
+        print("\n1. Adding last_checkpoint_name column...")
+        if 'last_checkpoint_name' not in existing:
+            session.execute(text("""
+                ALTER TABLE race_results
+                ADD COLUMN last_checkpoint_name VARCHAR(100)
+            """))
+            print("   ✓ last_checkpoint_name column added")
+        else:
+            print("   ✓ last_checkpoint_name column already exists")
+        
+        print("\n2. Adding last_checkpoint_time column...")
+        if 'last_checkpoint_time' not in existing:
+            session.execute(text("""
+                ALTER TABLE race_results
+                ADD COLUMN last_checkpoint_time TIMESTAMP
+            """))
+            print("   ✓ last_checkpoint_time column added")
+        else:
+            print("   ✓ last_checkpoint_time column already exists")
+        
+        print("\n3. Backfilling from split_times...")
+        count = backfill(session)
+        print(f"   ✓ {count} race results updated")
+        
+        session.commit()
+        
+        print("\n" + "=" * 60)
+        print("Migration completed successfully!")
+        print("=" * 60)
+        
+        return True
+        
+    except Exception as e:
+        session.rollback()
+        print(f"\n✗ Migration failed: {e}")
+        print("\nPlease check your database connection and try again.")
+        return False
+        
+    finally:
+        session.close()
+
+
+def rollback_migration():
+    """Remove last checkpoint fields (rollback)"""
+    print("=" * 60)
+    print("Rolling back Last Checkpoint Migration")
+    print("=" * 60)
+    
+    session = get_session()
+    
+    try:
+        print("\n1. Removing last_checkpoint_name column...")
+        session.execute(text("""
+            ALTER TABLE race_results 
+            DROP COLUMN IF EXISTS last_checkpoint_name
+        """))
+        print("   ✓ last_checkpoint_name column removed")
+        
+        print("\n2. Removing last_checkpoint_time column...")
+        session.execute(text("""
+            ALTER TABLE race_results 
+            DROP COLUMN IF EXISTS last_checkpoint_time
+        """))
+        print("   ✓ last_checkpoint_time column removed")
+        
+        session.commit()
+        
+        print("\n" + "=" * 60)
+        print("Rollback completed successfully!")
+        print("=" * 60)
+        
+        return True
+        
+    except Exception as e:
+        session.rollback()
+        print(f"\n✗ Rollback failed: {e}")
+        return False
+        
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "rollback":
+        success = rollback_migration()
+    else:
+        success = migrate_database()
+    
+    sys.exit(0 if success else 1)
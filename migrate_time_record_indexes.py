@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script: Add Time Record Indexes
+Adds composite indexes on time_records for race/timing point/participant
+lookups and for per-race listings ordered by timestamp
+"""
+from sqlalchemy import text
+from database import engine
+import sys
+
+
+INDEXES = {
+    'ix_timerecord_race_tp_part': '(race_id, timing_point_id, participant_id)',
+    'ix_timerecord_race_ts': '(race_id, timestamp)',
+}
+
+
+def _is_postgresql():
+    return engine.dialect.name == 'postgresql'
+
+
+def migrate_database():
+    """Create the composite indexes on time_records"""
+    print("=" * 60)
+    print("Time Record Index Migration")
+    print("=" * 60)
+    
+    # PostgreSQL can build the indexes without locking writes, but
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    concurrently = 'CONCURRENTLY ' if _is_postgresql() else ''
+    
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for step, (name, columns) in enumerate(INDEXES.items(), 1):
+                print(f"\n{step}. Creating {name}...")
+                conn.execute(text(
+                    f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON time_records {columns}"
+                ))
+                print(f"   ✓ {name} ready")
+        
+        print("\n" + "=" * 60)
+        print("Migration completed successfully!")
+        print("=" * 60)
+        print("\nVerify index usage with EXPLAIN, e.g.:")
+        print("  EXPLAIN SELECT participant_id FROM time_records")
+        print("  WHERE race_id = 1 AND timing_point_id = 1;")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Migration failed: {e}")
+        print("\nPlease check your database connection and try again.")
+        return False
+
+
+def rollback_migration():
+    """Drop the composite indexes (rollback)"""
+    print("=" * 60)
+    print("Rolling back Time Record Index Migration")
+    print("=" * 60)
+    
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for step, name in enumerate(INDEXES, 1):
+                print(f"\n{step}. Dropping {name}...")
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                print(f"   ✓ {name} removed")
+        
+        print("\n" + "=" * 60)
+        print("Rollback completed successfully!")
+        print("=" * 60)
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Rollback failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "rollback":
+        success = rollback_migration()
+    else:
+        success = migrate_database()
+    
+    sys.exit(0 if success else 1)
@@ -1,7 +1,7 @@
 """
 Database models for Race Timing System
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Enum, Boolean, Table
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Enum, Boolean, Table, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 import enum
@@ -126,7 +126,8 @@ class Race(Base):
     # Relationships
     event = relationship("Event", back_populates="races")
     legs = relationship("RaceLeg", back_populates="race", cascade="all, delete-orphan", order_by="RaceLeg.order")
-    timing_points = relationship("TimingPoint", back_populates="race", cascade="all, delete-orphan")
+    timing_points = relationship("TimingPoint", back_populates="race", cascade="all, delete-orphan",
+                                 order_by="TimingPoint.order", lazy="selectin")
     participants = relationship("Participant", secondary=race_participants, back_populates="races")
     results = relationship("RaceResult", back_populates="race", cascade="all, delete-orphan")
     
@@ -199,7 +200,7 @@ class TimingPoint(Base):
     # Relationships
     race = relationship("Race", back_populates="timing_points")
     time_records = relationship("TimeRecord", back_populates="timing_point", cascade="all, delete-orphan")
-    llrp_station = relationship("LLRPStation", back_populates="timing_points")
+    llrp_station = relationship("LLRPStation", back_populates="timing_points", lazy="joined")
     
     def __repr__(self):
         return f"<TimingPoint(id={self.id}, name='{self.name}', order={self.order})>"
@@ -208,6 +209,12 @@ class TimingPoint(Base):
 class TimeRecord(Base):
     """Individual timing record"""
     __tablename__ = 'time_records'
+    __table_args__ = (
+        # Start-record and per-checkpoint lookups (race, timing point, participant)
+        Index('ix_timerecord_race_tp_part', 'race_id', 'timing_point_id', 'participant_id'),
+        # Per-race listings ordered by time
+        Index('ix_timerecord_race_ts', 'race_id', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     race_id = Column(Integer, ForeignKey('races.id'), nullable=False)
@@ -249,6 +256,8 @@ class RaceResult(Base):
     
     # Additional data
     split_times = Column(String(1000))  # JSON string of split times
+    last_checkpoint_name = Column(String(100))  # Most recent entry in split_times
+    last_checkpoint_time = Column(DateTime)
     notes = Column(String(500))
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
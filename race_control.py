@@ -4,12 +4,20 @@ Manages live race timing from LLRP reader and manual input
 """
 from datetime import datetime, timedelta
 from models import TimeRecord, RaceResult, TimingSource, ParticipantStatus, race_participants, Race, TimingPoint, StartMode, Participant
-from database import get_session
-from race_manager import RaceManager, ParticipantManager
+from database import get_session, close_session
+from race_manager import get_race_manager, get_participant_manager
 from reader import LLRPReader
 from tag_detection import TagDetectionManager
 import json
+import itertools
+import queue
+import threading
 from sqlalchemy import and_
+from sqlalchemy.orm import joinedload, load_only
+
+# Results versions are unique across RaceControl instances, so a race that is
+# reset and re-created never reuses a version another instance handed out
+_result_versions = itertools.count(1)
 
 
 class RaceControl:
@@ -18,6 +26,15 @@ class RaceControl:
     def __init__(self, race_id):
         self.race_id = race_id
         self.active = False
+        self.results_callback = None
+        self.version = next(_result_versions)  # Bumped whenever rankings change
+        
+        # Background recalculation: at most one pending request, so bursts of
+        # edits collapse into a single calculate_results() run
+        self._recalc_queue = queue.Queue(maxsize=1)
+        self._recalc_thread = None
+        self._recalc_lock = threading.Lock()
+        self._closed = False
         
         # Initialize tag detection manager
         self.tag_detection_manager = TagDetectionManager()
@@ -55,6 +72,10 @@ class RaceControl:
                 make_callback(tp.id)
             )
     
+    def set_results_callback(self, callback):
+        """Set callback invoked with the race_id whenever results are recalculated"""
+        self.results_callback = callback
+    
     def start_timing(self):
         """Start accepting timing events"""
         self.active = True
@@ -106,7 +127,7 @@ class RaceControl:
     
     def _process_finalized_tag(self, epc, timestamp, station_id=None, rssi=None):
         """Process a finalized tag detection (after detection mode processing)"""
-        participant_manager = ParticipantManager()
+        participant_manager = get_participant_manager()
         # Find participant by RFID tag
         participant = participant_manager.get_participant_by_rfid(epc)
         
@@ -115,7 +136,7 @@ class RaceControl:
             return
         
         # Check if this is a chip start race
-        race_manager = RaceManager()
+        race_manager = get_race_manager()
         race = race_manager.get_race(self.race_id)
         
         if race.start_mode == StartMode.CHIP_START:
@@ -237,7 +258,7 @@ class RaceControl:
         if timestamp is None:
             timestamp = datetime.now()
         
-        participant_manager = ParticipantManager()
+        participant_manager = get_participant_manager()
         # Find participant by bib number
         participant = participant_manager.get_participant_by_bib(self.race_id, bib_number)
         if not participant:
@@ -296,7 +317,7 @@ class RaceControl:
         if timestamp is None:
             timestamp = datetime.now()
         
-        participant_manager = ParticipantManager()
+        participant_manager = get_participant_manager()
         # Find participant by bib number
         participant = participant_manager.get_participant_by_bib(self.race_id, bib_number)
         if not participant:
@@ -352,6 +373,50 @@ class RaceControl:
         # Calculate rankings once at the end
         self._calculate_rankings()
 
+    def request_recalculation(self):
+        """Schedule calculate_results() on this race's worker thread and return immediately"""
+        with self._recalc_lock:
+            if self._closed:
+                return
+            if self._recalc_thread is None:
+                self._recalc_thread = threading.Thread(
+                    target=self._recalc_worker,
+                    name=f"race-{self.race_id}-recalc",
+                    daemon=True
+                )
+                self._recalc_thread.start()
+        try:
+            self._recalc_queue.put_nowait(True)
+        except queue.Full:
+            # A recalculation is already pending and will include this change
+            pass
+    
+    def _recalc_worker(self):
+        """Run queued recalculations until close() is called"""
+        while True:
+            self._recalc_queue.get()
+            if self._closed:
+                return
+            try:
+                self.calculate_results()
+            except Exception as e:
+                print(f"Error recalculating results for race {self.race_id}: {e}")
+            finally:
+                # Each run gets a fresh session on this long-lived thread
+                close_session()
+    
+    def close(self):
+        """Stop the background recalculation worker"""
+        with self._recalc_lock:
+            self._closed = True
+            running = self._recalc_thread is not None
+        if running:
+            try:
+                self._recalc_queue.put_nowait(None)
+            except queue.Full:
+                # Worker will see _closed after the pending request
+                pass
+    
     def _update_result(self, participant_id, calculate_rankings=True):
         """Update or create race result for a participant"""
         session = get_session()
@@ -400,6 +465,8 @@ class RaceControl:
         start_time = None
         finish_time = None
         split_times = {}
+        last_checkpoint_name = None
+        last_checkpoint_time = None
         status = ParticipantStatus.REGISTERED
         
         # Check for Gun Start (Race Start Time)
@@ -417,6 +484,8 @@ class RaceControl:
                 # Use the FIRST read for each timing point (since times are ordered by timestamp)
                 if tp.name not in split_times:
                     split_times[tp.name] = time_record.timestamp.isoformat()
+                    last_checkpoint_name = tp.name
+                    last_checkpoint_time = time_record.timestamp
                     
                     if tp.is_start:
                         # Chip start overrides gun start
@@ -440,6 +509,8 @@ class RaceControl:
         result.start_time = start_time
         result.finish_time = finish_time
         result.split_times = json.dumps(split_times)
+        result.last_checkpoint_name = last_checkpoint_name
+        result.last_checkpoint_time = last_checkpoint_time
         result.total_time = None
         
         # Calculate total time
@@ -661,9 +732,18 @@ class RaceControl:
             result.gender_rank = None
             
         session.commit()
+        self.version = next(_result_versions)
+        
+        if self.results_callback:
+            self.results_callback(self.race_id)
     
-    def get_live_results(self, limit=None):
-        """Get current race standings"""
+    def get_live_results(self, limit=None, summary_only=False):
+        """Get current race standings
+        
+        With summary_only, only the columns used by leaderboard/results views
+        are fetched (no split_times, notes or sub-rankings), with each
+        participant's name, gender and age joined in the same query.
+        """
         session = get_session()
         
         query = session.query(RaceResult).filter(
@@ -673,6 +753,20 @@ class RaceControl:
             RaceResult.total_time
         )
         
+        if summary_only:
+            query = query.options(
+                load_only(
+                    RaceResult.id, RaceResult.participant_id, RaceResult.overall_rank,
+                    RaceResult.bib_number, RaceResult.total_time, RaceResult.start_time,
+                    RaceResult.finish_time, RaceResult.status, RaceResult.category,
+                    RaceResult.last_checkpoint_name, RaceResult.last_checkpoint_time
+                ),
+                joinedload(RaceResult.participant).load_only(
+                    Participant.id, Participant.first_name, Participant.last_name,
+                    Participant.gender, Participant.age
+                )
+            )
+        
         if limit:
             query = query.limit(limit)
         
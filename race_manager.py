@@ -10,8 +10,10 @@ from sqlalchemy import and_
 class EventManager:
     """Manages event creation and configuration"""
     
-    def __init__(self):
-        self.session = get_session()
+    @property
+    def session(self):
+        """Session for the calling thread, so one instance can be shared across requests"""
+        return get_session()
     
     def create_event(self, name, date, location=None, description=None):
         """Create a new event"""
@@ -50,8 +52,10 @@ class EventManager:
 class RaceManager:
     """Manages race creation and configuration"""
     
-    def __init__(self):
-        self.session = get_session()
+    @property
+    def session(self):
+        """Session for the calling thread, so one instance can be shared across requests"""
+        return get_session()
     
     def create_race(self, name, race_type, date, location=None, description=None, event_id=None, start_mode="mass_start"):
         """Create a new race"""
@@ -228,8 +232,10 @@ class RaceManager:
 class ParticipantManager:
     """Manages participants"""
     
-    def __init__(self):
-        self.session = get_session()
+    @property
+    def session(self):
+        """Session for the calling thread, so one instance can be shared across requests"""
+        return get_session()
     
     def create_participant(self, first_name, last_name, email=None, phone=None, 
                           gender=None, age=None, rfid_tag=None):
@@ -362,3 +368,31 @@ def get_age_group(age, gender=None):
             return f"{gender_prefix} {bracket}"
     
     return bracket
+
+
+# Singleton instances. The managers hold no per-request state (session is
+# looked up per thread), so one of each is shared by all requests.
+_event_manager = None
+_race_manager = None
+_participant_manager = None
+
+def get_event_manager():
+    """Get or create EventManager singleton"""
+    global _event_manager
+    if _event_manager is None:
+        _event_manager = EventManager()
+    return _event_manager
+
+def get_race_manager():
+    """Get or create RaceManager singleton"""
+    global _race_manager
+    if _race_manager is None:
+        _race_manager = RaceManager()
+    return _race_manager
+
+def get_participant_manager():
+    """Get or create ParticipantManager singleton"""
+    global _participant_manager
+    if _participant_manager is None:
+        _participant_manager = ParticipantManager()
+    return _participant_manager
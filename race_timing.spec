@@ -57,6 +57,7 @@ a = Analysis(
         'PIL',
         'PIL.Image',
         'numpy',
+        'orjson',
         'click',
         'tabulate',
         'dateutil',
@@ -5,7 +5,6 @@ This module provides a class-based RFID reader that can be controlled programmat
 
 import time
 import json
-import requests
 from datetime import datetime
 import threading
 import random
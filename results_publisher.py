@@ -59,7 +59,7 @@ class ResultsPublisher:
         finally:
             session.close()
     
-    def publish_race(self, race_id):
+    def publish_race(self, race_id, include_event=True):
         """Publish a race to the results site"""
         session = get_session()
         try:
@@ -79,7 +79,7 @@ class ResultsPublisher:
             }
             
             # Publish event first if it exists
-            if race.event_id:
+            if include_event and race.event_id:
                 self.publish_event(race.event_id)
             
             result = self._make_webhook_request('/webhook/publish-race', data)
@@ -90,8 +90,12 @@ class ResultsPublisher:
         finally:
             session.close()
     
-    def publish_results(self, race_id, publish_type='manual', published_by='admin'):
-        """Publish race results to the results site"""
+    def publish_results(self, race_id, publish_type='manual', published_by='admin', include_event=True):
+        """Publish race results to the results site
+        
+        Pass include_event=False when the caller has already published the
+        race's event (e.g. when publishing every race in an event).
+        """
         session = get_session()
         try:
             race = session.query(Race).filter_by(id=race_id).first()
@@ -100,7 +104,7 @@ class ResultsPublisher:
                 return False
             
             # Ensure race is published first
-            self.publish_race(race_id)
+            self.publish_race(race_id, include_event=include_event)
             
             # Get live results using RaceControl
             race_control = RaceControl(race_id)
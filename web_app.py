@@ -1,48 +1,257 @@
 """
 Flask Web Application for Race Timing System
 """
-from flask import Flask, render_template, jsonify, request, Response, redirect
+from flask import Flask, render_template, jsonify, request, Response, redirect, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from datetime import datetime
-from database import get_session, init_db
-from race_manager import RaceManager, ParticipantManager, EventManager
-from llrp_station_manager import LLRPStationManager
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload
+from database import get_session, close_session, init_db
+from race_manager import get_race_manager, get_participant_manager, get_event_manager
+from llrp_station_manager import get_llrp_station_manager
 from race_control import RaceControl
 from report_generator import ReportGenerator
-from models import RaceType, ParticipantStatus, StartMode
+from models import Race, RaceType, ParticipantStatus, StartMode, TimingPoint
 from reader_service import RFIDReaderService
 import json
+import math
+import zlib
+import orjson
 import time
 import threading
 import queue
 import os
 import atexit
 import signal
+import socket
+import itertools
+import functools
+from contextlib import contextmanager
+import numpy as np
+import hashlib
+from collections import OrderedDict
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from config_manager import get_config_manager
-import requests
+import psycopg2
+from psycopg2 import pool as _pg_pool
+
+logger = logging.getLogger(__name__)
+
+@functools.cache
+def _http_session():
+    """Shared HTTP session so outbound calls reuse keep-alive connections.
+    
+    requests is only needed for the webhook test, so it is imported on
+    first use rather than when the app starts.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    # No retries: the webhook test reports the real error from one attempt
+    # and must finish within the time test_webhook_connection waits for it
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# The tag-read callback runs on reader threads at hundreds of reads/sec, so
+# once the app is started logging there only enqueues the record; a listener
+# thread does the writes. See start_log_listener().
+_log_listener = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes jsonify() responses with orjson.
+    
+    Keys are not sorted. Datetimes and dates are encoded natively as ISO 8601,
+    the format the API uses everywhere (the streamed and cached bodies that
+    call orjson.dumps directly match it). Types orjson doesn't handle still go
+    through Flask's default().
+    """
+    
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._OPTIONS),
+            mimetype=self.mimetype
+        )
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Global race control instances
 active_race_controls = {}
 
+# Tag dispatch table: LLRP station_id -> RaceControls with a timing point on
+# that station. Rebuilt by rebuild_tag_dispatch() and swapped in whole, so
+# llrp_tag_callback can read it without locking.
+station_to_races = {}
+tag_dispatch_lock = threading.Lock()
+
+# Live leaderboard stream subscribers: race_id -> set of queues. Each queue
+# holds at most one pending "results changed" tick.
+race_update_subscribers = {}
+race_update_lock = threading.Lock()
+
 # Global LLRP service instances
 # Map station_id -> RFIDReaderService
 active_llrp_services = {}
 llrp_services_lock = threading.Lock()
 
-# Event queue for Server-Sent Events
-llrp_event_queue = queue.Queue()
+# Cache of serialized /api/races/<id> responses: race_id -> (etag, body).
+# Entries are dropped by invalidate_race_cache() whenever the race, its timing
+# points or its participants change.
+race_detail_cache = {}
+race_cache_generation = 0
+race_etags = itertools.count(1)
+
+# Serialized /api/system-config response: (ConfigManager.version, etag, body).
+# Any config write bumps the version, so a stale entry is simply rebuilt.
+system_config_cache = None
+
+# Races known to exist: race_id -> expiry (time.monotonic()). Only hits are
+# cached; invalidate_race_cache() drops entries so deleted races stop resolving.
+race_exists_cache = {}
+RACE_EXISTS_TTL_SECONDS = 60
+
+# LRU cache of results/leaderboard payloads keyed on
+# (race_id, endpoint, filters..., RaceControl.version)
+results_cache = OrderedDict()
+results_cache_lock = threading.Lock()
+RESULTS_CACHE_SIZE = 128
+
+# Server-Sent Events subscribers for /api/llrp/events. Each client gets its own
+# bounded queue so a slow client can't starve the others or grow memory unbounded.
+llrp_subscribers = set()
+llrp_subscribers_lock = threading.Lock()
+LLRP_SUBSCRIBER_QUEUE_SIZE = 1000  # Status events evict the oldest entry beyond this
+LLRP_SUBSCRIBER_TAG_QUEUE_SIZE = 5000  # Tag reads may fill up to this before the client is dropped
+
+# SSE writes coalesce events arriving within a short window into one chunk
+SSE_BATCH_MAX_EVENTS = 64
+SSE_BATCH_WINDOW_SECONDS = 0.02
 
 # Configuration file path
 LLRP_CONFIG_FILE = 'llrp_config.json'
 
+# Parsed LLRP config, keyed on the file's st_mtime_ns
+_llrp_cfg_cache = {'mtime': None, 'data': None, 'lock': threading.Lock()}
+
+# Standard age groups offered by /api/age-groups. The list is static, so it is
+# built and serialized once at import rather than on every request.
+AGE_GROUP_BRACKETS = ["Under 20", "20-29", "30-39", "40-49", "50-59", "60+"]
+AGE_GROUP_GENDERS = [("M", "Male"), ("F", "Female")]
+AGE_GROUPS = [
+    {'value': f"{gender_name} {bracket}", 'label': f"{gender_name} {bracket}"}
+    for _, gender_name in AGE_GROUP_GENDERS
+    for bracket in AGE_GROUP_BRACKETS
+] + [
+    # Non-gendered options
+    {'value': bracket, 'label': bracket}
+    for bracket in AGE_GROUP_BRACKETS
+]
+AGE_GROUPS_JSON = json.dumps(AGE_GROUPS)
+
 # Session teardown - CRITICAL for preventing connection pool exhaustion
 @app.teardown_appcontext
 def shutdown_session(exception=None):
     """Remove database session at the end of the request"""
-    from database import Session
-    Session.remove()
+    close_session()
+
+def get_race_control(race_id):
+    """Get the active RaceControl for a race, creating it if needed"""
+    race_control = active_race_controls.get(race_id)
+    if race_control is None:
+        race_control = RaceControl(race_id)
+        race_control.set_results_callback(notify_race)
+        active_race_controls[race_id] = race_control
+        rebuild_tag_dispatch()
+    return race_control
+
+def rebuild_tag_dispatch():
+    """Rebuild station_to_races after race controls or timing point stations change"""
+    global station_to_races
+    with tag_dispatch_lock:
+        controls = dict(active_race_controls)
+        dispatch = {}
+        if controls:
+            session = get_session()
+            rows = session.query(TimingPoint.llrp_station_id, TimingPoint.race_id).filter(
+                TimingPoint.race_id.in_(list(controls)),
+                TimingPoint.llrp_station_id.isnot(None)
+            ).distinct().all()
+            for station_id, race_id in rows:
+                dispatch.setdefault(station_id, []).append(controls[race_id])
+        station_to_races = dispatch
+
+def notify_race(race_id):
+    """Wake live leaderboard streams for a race after its results change"""
+    with race_update_lock:
+        subscribers = list(race_update_subscribers.get(race_id, ()))
+    for q in subscribers:
+        try:
+            q.put_nowait(True)
+        except queue.Full:
+            # A refresh is already pending for this subscriber
+            pass
+
+def cached_results(key, build):
+    """Return the cached value for key, building and storing it on a miss.
+    
+    Keys start with the race_id and end with the RaceControl version, so a
+    recalculation makes older entries unreachable; they age out via LRU.
+    """
+    with results_cache_lock:
+        if key in results_cache:
+            results_cache.move_to_end(key)
+            return results_cache[key]
+    value = build()
+    with results_cache_lock:
+        results_cache[key] = value
+        while len(results_cache) > RESULTS_CACHE_SIZE:
+            results_cache.popitem(last=False)
+    return value
+
+def drop_results_cache(race_id=None):
+    """Drop cached results for race_id (all races when None) after edits outside RaceControl"""
+    with results_cache_lock:
+        if race_id is None:
+            results_cache.clear()
+        else:
+            for key in [k for k in results_cache if k[0] == race_id]:
+                del results_cache[key]
+
+def race_exists(race_id):
+    """Check a race exists without loading it, caching hits for RACE_EXISTS_TTL_SECONDS"""
+    expires = race_exists_cache.get(race_id)
+    if expires is not None and expires > time.monotonic():
+        return True
+    session = get_session()
+    found = session.query(Race.id).filter(Race.id == race_id).first() is not None
+    if found:
+        race_exists_cache[race_id] = time.monotonic() + RACE_EXISTS_TTL_SECONDS
+    return found
+
+def invalidate_race_cache(race_id=None):
+    """Drop cached race details for race_id, or for every race when race_id is None"""
+    global race_cache_generation
+    race_cache_generation += 1
+    if race_id is None:
+        race_detail_cache.clear()
+        race_exists_cache.clear()
+    else:
+        race_detail_cache.pop(race_id, None)
+        race_exists_cache.pop(race_id, None)
+    drop_results_cache(race_id)
 
 # Shutdown handler for LLRP stations
 def shutdown_llrp_stations():
@@ -56,11 +265,14 @@ def shutdown_llrp_stations():
             station_ids = list(active_llrp_services.keys())
             
             # Create manager and get its session
-            manager = LLRPStationManager()
+            manager = get_llrp_station_manager()
             
             for station_id in station_ids:
                 try:
-                    service = active_llrp_services[station_id]
+                    service = active_llrp_services.pop(station_id, None)
+                    if service is None:
+                        # Already stopped by a concurrent request
+                        continue
                     print(f"Stopping station {station_id}...")
                     
                     # Stop the service
@@ -75,8 +287,6 @@ def shutdown_llrp_stations():
                     except Exception as db_error:
                         print(f"  ⚠ Station {station_id} stopped but database update failed: {db_error}")
                     
-                    del active_llrp_services[station_id]
-                    
                 except Exception as e:
                     print(f"  ✗ Error stopping station {station_id}: {e}")
             
@@ -101,10 +311,33 @@ def signal_handler(sig, frame):
     import sys
     sys.exit(0)
 
-# Register shutdown handlers
+# Stop LLRP stations when the process exits. Signal handlers are only installed
+# when run directly (see __main__) so gunicorn keeps its graceful shutdown.
 atexit.register(shutdown_llrp_stations)
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
+
+
+def init_app():
+    """Prepare this process to serve requests and return the app.
+    
+    Creates any missing tables. Used by __main__, the desktop launcher and
+    gunicorn ('web_app:init_app()'), since gunicorn never runs __main__.
+    """
+    init_db()
+    start_log_listener()
+    return app
+
+
+def start_log_listener():
+    """Route this module's log records through a queue to a listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
 # ============================================================================
 # WEB PAGES
@@ -184,12 +417,12 @@ def event_control_page(event_id):
 def get_events():
     """Get all events"""
     try:
-        manager = EventManager()
+        manager = get_event_manager()
         events = manager.list_events()
         return jsonify([{
             'id': e.id,
             'name': e.name,
-            'date': e.date.isoformat() if e.date else None,
+            'date': e.date,
             'location': e.location,
             'description': e.description,
             'race_count': len(e.races)
@@ -204,7 +437,7 @@ def create_event():
     if not data or not data.get('name') or not data.get('date'):
         return jsonify({'error': 'name and date are required'}), 400
     try:
-        manager = EventManager()
+        manager = get_event_manager()
         event = manager.create_event(
             name=data['name'],
             date=data['date'],
@@ -223,7 +456,7 @@ def create_event():
 @app.route('/api/events/<int:event_id>', methods=['GET'])
 def get_event(event_id):
     """Get event details"""
-    manager = EventManager()
+    manager = get_event_manager()
     event = manager.get_event(event_id)
     
     if not event:
@@ -247,8 +480,11 @@ def get_event(event_id):
 @app.route('/api/events/<int:event_id>', methods=['DELETE'])
 def delete_event(event_id):
     """Delete an event"""
-    manager = EventManager()
+    manager = get_event_manager()
     if manager.delete_event(event_id):
+        # Deleting an event cascades to its races
+        invalidate_race_cache()
+        rebuild_tag_dispatch()
         return jsonify({'message': 'Event deleted successfully'})
     return jsonify({'error': 'Event not found'}), 404
 
@@ -260,7 +496,7 @@ def delete_event(event_id):
 @app.route('/api/llrp-stations', methods=['GET'])
 def get_llrp_stations():
     """Get all LLRP stations"""
-    manager = LLRPStationManager()
+    manager = get_llrp_station_manager()
     stations = manager.list_stations()
     
     return jsonify([{
@@ -270,15 +506,15 @@ def get_llrp_stations():
         'reader_port': s.reader_port,
         'cooldown_seconds': s.cooldown_seconds,
         'is_active': s.is_active,
-        'last_connected': s.last_connected.isoformat() if s.last_connected else None,
-        'created_at': s.created_at.isoformat()
+        'last_connected': s.last_connected,
+        'created_at': s.created_at
     } for s in stations])
 
 @app.route('/api/llrp-stations', methods=['POST'])
 def create_llrp_station():
     """Create a new LLRP station"""
     data = request.json
-    manager = LLRPStationManager()
+    manager = get_llrp_station_manager()
     
     try:
         station = manager.create_station(
@@ -299,7 +535,7 @@ def create_llrp_station():
 @app.route('/api/llrp-stations/<int:station_id>', methods=['GET'])
 def get_llrp_station(station_id):
     """Get a specific LLRP station"""
-    manager = LLRPStationManager()
+    manager = get_llrp_station_manager()
     station = manager.get_station(station_id)
     
     if not station:
@@ -324,11 +560,12 @@ def get_llrp_station(station_id):
 def update_llrp_station(station_id):
     """Update an LLRP station"""
     data = request.json
-    manager = LLRPStationManager()
+    manager = get_llrp_station_manager()
     
     station = manager.update_station(station_id, **data)
     if not station:
         return jsonify({'error': 'Station not found'}), 404
+    invalidate_race_cache()
     
     return jsonify({
         'id': station.id,
@@ -339,8 +576,10 @@ def update_llrp_station(station_id):
 @app.route('/api/llrp-stations/<int:station_id>', methods=['DELETE'])
 def delete_llrp_station(station_id):
     """Delete an LLRP station"""
-    manager = LLRPStationManager()
+    manager = get_llrp_station_manager()
     if manager.delete_station(station_id):
+        invalidate_race_cache()
+        rebuild_tag_dispatch()
         return jsonify({'message': 'Station deleted successfully'})
     return jsonify({'error': 'Station not found'}), 404
 
@@ -352,16 +591,16 @@ def delete_llrp_station(station_id):
 @app.route('/api/races', methods=['GET'])
 def get_races():
     """Get all races"""
-    manager = RaceManager()
+    manager = get_race_manager()
     races = manager.list_races()
     
     return jsonify([{
         'id': r.id,
         'name': r.name,
         'race_type': r.race_type.value,
-        'date': r.date.isoformat(),
-        'start_time': r.start_time.isoformat() if r.start_time else None,
-        'finish_time': r.finish_time.isoformat() if r.finish_time else None,
+        'date': r.date,
+        'start_time': r.start_time,
+        'finish_time': r.finish_time,
         'location': r.location,
         'description': r.description,
         'participant_count': len(r.participants),
@@ -374,7 +613,7 @@ def get_races():
 def create_race():
     """Create a new race"""
     data = request.json
-    manager = RaceManager()
+    manager = get_race_manager()
     
     race = manager.create_race(
         name=data['name'],
@@ -449,28 +688,28 @@ def create_race_from_template():
     session.add(race)
     session.flush()  # Get race.id
     
-    # Create legs from template
-    for leg_data in template['legs']:
-        leg = RaceLeg(
-            race_id=race.id,
-            name=leg_data['name'],
-            leg_type=LegType(leg_data['leg_type']),
-            distance=leg_data['distance'],
-            distance_unit=leg_data['distance_unit'],
-            order=leg_data['order']
-        )
-        session.add(leg)
-    
-    # Create timing points from template
-    for tp_data in template['timing_points']:
-        timing_point = TimingPoint(
-            race_id=race.id,
-            name=tp_data['name'],
-            order=tp_data['order'],
-            is_start=tp_data['is_start'],
-            is_finish=tp_data['is_finish']
-        )
-        session.add(timing_point)
+    # Create legs from template (single multi-row INSERT)
+    leg_rows = [{
+        'race_id': race.id,
+        'name': leg_data['name'],
+        'leg_type': LegType(leg_data['leg_type']),
+        'distance': leg_data['distance'],
+        'distance_unit': leg_data['distance_unit'],
+        'order': leg_data['order']
+    } for leg_data in template['legs']]
+    if leg_rows:
+        session.execute(insert(RaceLeg), leg_rows)
+    
+    # Create timing points from template (single multi-row INSERT)
+    tp_rows = [{
+        'race_id': race.id,
+        'name': tp_data['name'],
+        'order': tp_data['order'],
+        'is_start': tp_data['is_start'],
+        'is_finish': tp_data['is_finish']
+    } for tp_data in template['timing_points']]
+    if tp_rows:
+        session.execute(insert(TimingPoint), tp_rows)
     
     session.commit()
     
@@ -486,56 +725,16 @@ def create_race_from_template():
 def get_race(race_id):
     """Get race details"""
     try:
-        race_manager = RaceManager()
-        race = race_manager.get_race(race_id)
-        
-        if not race:
-            return jsonify({'error': 'Race not found'}), 404
-        
-        # Get timing points with LLRP station info
-        timing_points = []
-        for tp in race.timing_points:
-            tp_data = {
-                'id': tp.id,
-                'name': tp.name,
-                'order': tp.order,
-                'is_start': tp.is_start,
-                'is_finish': tp.is_finish,
-                'llrp_station_id': tp.llrp_station_id,
-                'llrp_station': None
-            }
-            
-            # Add LLRP station info if assigned
-            if tp.llrp_station_id and tp.llrp_station:
-                tp_data['llrp_station'] = {
-                    'id': tp.llrp_station.id,
-                    'name': tp.llrp_station.name
-                }
-            
-            timing_points.append(tp_data)
-        
-        return jsonify({
-            'id': race.id,
-            'name': race.name,
-            'race_type': race.race_type.value if race.race_type else None,
-            'date': race.date.isoformat() if race.date else None,
-            'location': race.location,
-            'description': race.description,
-            'start_time': race.start_time.isoformat() if race.start_time else None,
-            'finish_time': race.finish_time.isoformat() if race.finish_time else None,
-            'start_mode': race.start_mode.value if race.start_mode else 'mass_start',
-            'llrp_enabled': race.llrp_enabled,
-            'event_id': race.event_id,
-            'event_name': race.event.name if race.event else None,
-            'participant_count': len(race.participants),
-            'timing_points': timing_points,
-            'age_groups': race.age_groups or [],
-            'participants': [{
-                'id': p.id,
-                'name': p.full_name,
-                'rfid_tag': p.rfid_tag
-            } for p in race.participants]
-        })
+        cached = race_detail_cache.get(race_id)
+        if cached is None:
+            cached = build_race_detail(race_id)
+            if cached is None:
+                return jsonify({'error': 'Race not found'}), 404
+        
+        etag, body = cached
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         print(f"Error getting race {race_id}: {e}")
         import traceback
@@ -543,6 +742,67 @@ def get_race(race_id):
         return jsonify({'error': str(e)}), 500
 
 
+def build_race_detail(race_id):
+    """Serialize race details and cache them; returns (etag, body) or None if the race does not exist"""
+    generation = race_cache_generation
+    race_manager = get_race_manager()
+    race = race_manager.get_race(race_id)
+    
+    if not race:
+        return None
+    
+    # Get timing points with LLRP station info
+    timing_points = []
+    for tp in race.timing_points:
+        tp_data = {
+            'id': tp.id,
+            'name': tp.name,
+            'order': tp.order,
+            'is_start': tp.is_start,
+            'is_finish': tp.is_finish,
+            'llrp_station_id': tp.llrp_station_id,
+            'llrp_station': None
+        }
+        
+        # Add LLRP station info if assigned
+        if tp.llrp_station_id and tp.llrp_station:
+            tp_data['llrp_station'] = {
+                'id': tp.llrp_station.id,
+                'name': tp.llrp_station.name
+            }
+        
+        timing_points.append(tp_data)
+    
+    data = {
+        'id': race.id,
+        'name': race.name,
+        'race_type': race.race_type.value if race.race_type else None,
+        'date': race.date.isoformat() if race.date else None,
+        'location': race.location,
+        'description': race.description,
+        'start_time': race.start_time.isoformat() if race.start_time else None,
+        'finish_time': race.finish_time.isoformat() if race.finish_time else None,
+        'start_mode': race.start_mode.value if race.start_mode else 'mass_start',
+        'llrp_enabled': race.llrp_enabled,
+        'event_id': race.event_id,
+        'event_name': race.event.name if race.event else None,
+        'participant_count': len(race.participants),
+        'timing_points': timing_points,
+        'age_groups': race.age_groups or [],
+        'participants': [{
+            'id': p.id,
+            'name': p.full_name,
+            'rfid_tag': p.rfid_tag
+        } for p in race.participants]
+    }
+    
+    cached = (f'race-{race_id}-{next(race_etags)}', json.dumps(data))
+    # Don't cache a response built while the race was being modified
+    if generation == race_cache_generation:
+        race_detail_cache[race_id] = cached
+    return cached
+
+
 @app.route('/api/races/<int:race_id>/start', methods=['POST'])
 def start_race(race_id):
     """Start the race (set start time to now)"""
@@ -571,28 +831,24 @@ def start_race(race_id):
             
             if start_tp:
                 print(f"Found start timing point: {start_tp.name}")
-                # Get all participants
-                participant_count = 0
-                for participant in race.participants:
-                    # Check if start record already exists
-                    existing = session.query(TimeRecord).filter(
-                        TimeRecord.race_id == race_id,
-                        TimeRecord.participant_id == participant.id,
-                        TimeRecord.timing_point_id == start_tp.id
-                    ).first()
-                    
-                    if not existing:
-                        # Create start record
-                        record = TimeRecord(
-                            race_id=race_id,
-                            participant_id=participant.id,
-                            timing_point_id=start_tp.id,
-                            timestamp=race.start_time,
-                            source=TimingSource.SYSTEM
-                        )
-                        session.add(record)
-                        participant_count += 1
-                print(f"Created {participant_count} start records")
+                # Find participants that already have a start record in one query
+                existing_ids = {pid for (pid,) in session.query(TimeRecord.participant_id).filter(
+                    TimeRecord.race_id == race_id,
+                    TimeRecord.timing_point_id == start_tp.id
+                ).all()}
+                
+                # Bulk insert start records for everyone else
+                new_records = [{
+                    'race_id': race_id,
+                    'participant_id': participant.id,
+                    'timing_point_id': start_tp.id,
+                    'timestamp': race.start_time,
+                    'source': TimingSource.SYSTEM
+                } for participant in race.participants if participant.id not in existing_ids]
+                
+                if new_records:
+                    session.execute(insert(TimeRecord), new_records)
+                print(f"Created {len(new_records)} start records")
             else:
                 print("No start timing point found")
         else:
@@ -600,19 +856,20 @@ def start_race(race_id):
         
         print("Committing changes to database...")
         session.commit()
+        invalidate_race_cache(race_id)
         print("Database commit successful")
         
         # Trigger recalculation to update all participants to STARTED
         print("Triggering result calculation...")
-        if race_id not in active_race_controls:
-            active_race_controls[race_id] = RaceControl(race_id)
+        race_control = get_race_control(race_id)
         
         # Activate timing to process LLRP tag reads
-        active_race_controls[race_id].start_timing()
+        race_control.start_timing()
         print("Race timing activated for LLRP tag processing")
         
-        active_race_controls[race_id].calculate_results()
-        print("Result calculation complete")
+        # Recalculate in the background so the response only waits for the commit
+        race_control.request_recalculation()
+        print("Result calculation scheduled")
         
         return jsonify({
             'message': 'Race started',
@@ -641,6 +898,7 @@ def update_race_start_time(race_id):
         start_time = datetime.fromisoformat(data['start_time'].replace('Z', '+00:00'))
         race.start_time = start_time
         session.commit()
+        invalidate_race_cache(race_id)
         
         return jsonify({
             'message': 'Start time updated',
@@ -661,6 +919,7 @@ def stop_race(race_id):
         
     race.finish_time = datetime.utcnow()
     session.commit()
+    invalidate_race_cache(race_id)
     
     # Stop LLRP if running
     try:
@@ -701,24 +960,29 @@ def reset_race(race_id):
     # Delete all time records
     session.query(TimeRecord).filter(TimeRecord.race_id == race_id).delete()
     
-    # Reset all race results
-    results = session.query(RaceResult).filter(RaceResult.race_id == race_id).all()
-    for result in results:
-        result.status = ParticipantStatus.REGISTERED
-        result.start_time = None
-        result.finish_time = None
-        result.total_time = None
-        result.split_times = None
-        result.overall_rank = None
-        result.category_rank = None
-        result.gender_rank = None
+    # Reset all race results in a single UPDATE
+    session.query(RaceResult).filter(RaceResult.race_id == race_id).update({
+        RaceResult.status: ParticipantStatus.REGISTERED,
+        RaceResult.start_time: None,
+        RaceResult.finish_time: None,
+        RaceResult.total_time: None,
+        RaceResult.split_times: None,
+        RaceResult.last_checkpoint_name: None,
+        RaceResult.last_checkpoint_time: None,
+        RaceResult.overall_rank: None,
+        RaceResult.category_rank: None,
+        RaceResult.gender_rank: None
+    }, synchronize_session=False)
         
     session.commit()
+    invalidate_race_cache(race_id)
     
     # Stop timing if active
     if race_id in active_race_controls:
         active_race_controls[race_id].stop_timing()
-        del active_race_controls[race_id]
+        active_race_controls.pop(race_id).close()
+        rebuild_tag_dispatch()
+    notify_race(race_id)
         
     return jsonify({'message': 'Race reset successfully'})
 
@@ -726,7 +990,7 @@ def reset_race(race_id):
 def add_timing_point(race_id):
     """Add a timing point to a race"""
     data = request.json
-    manager = RaceManager()
+    manager = get_race_manager()
     try:
         tp = manager.add_timing_point(
             race_id=race_id,
@@ -736,6 +1000,8 @@ def add_timing_point(race_id):
             is_finish=data.get('is_finish', False),
             llrp_station_id=data.get('llrp_station_id')
         )
+        invalidate_race_cache(race_id)
+        rebuild_tag_dispatch()
         return jsonify({
             'id': tp.id,
             'name': tp.name,
@@ -768,6 +1034,8 @@ def update_timing_point(race_id, tp_id):
         tp.order = data['order']
     
     session.commit()
+    invalidate_race_cache(race_id)
+    rebuild_tag_dispatch()
     
     return jsonify({
         'id': tp.id,
@@ -779,8 +1047,10 @@ def update_timing_point(race_id, tp_id):
 @app.route('/api/races/<int:race_id>/timing-points/<int:tp_id>', methods=['DELETE'])
 def delete_timing_point(race_id, tp_id):
     """Delete a timing point"""
-    manager = RaceManager()
+    manager = get_race_manager()
     if manager.delete_timing_point(tp_id):
+        invalidate_race_cache(race_id)
+        rebuild_tag_dispatch()
         return jsonify({'message': 'Timing point deleted'})
     return jsonify({'error': 'Timing point not found'}), 404
 
@@ -788,13 +1058,14 @@ def delete_timing_point(race_id, tp_id):
 def update_age_groups(race_id):
     """Update race age groups"""
     data = request.json
-    manager = RaceManager()
+    manager = get_race_manager()
     
     try:
         age_groups = data.get('age_groups', [])
         age_groups_json = json.dumps(age_groups)
         
         if manager.update_race_age_groups(race_id, age_groups_json):
+            invalidate_race_cache(race_id)
             return jsonify({'message': 'Age groups updated'})
         return jsonify({'error': 'Race not found'}), 404
     except Exception as e:
@@ -803,8 +1074,10 @@ def update_age_groups(race_id):
 @app.route('/api/races/<int:race_id>', methods=['DELETE'])
 def delete_race(race_id):
     """Delete a race"""
-    manager = RaceManager()
+    manager = get_race_manager()
     if manager.delete_race(race_id):
+        invalidate_race_cache(race_id)
+        rebuild_tag_dispatch()
         return jsonify({'message': 'Race deleted successfully'})
     return jsonify({'error': 'Race not found'}), 404
 
@@ -814,9 +1087,10 @@ def update_race_event(race_id):
     data = request.json
     event_id = data.get('event_id')  # Can be None to unassign
     
-    manager = RaceManager()
+    manager = get_race_manager()
     try:
         if manager.update_race_event(race_id, event_id):
+            invalidate_race_cache(race_id)
             return jsonify({'message': 'Race event updated successfully'})
         return jsonify({'error': 'Race not found'}), 404
     except ValueError as e:
@@ -834,23 +1108,24 @@ def get_race_participants(race_id):
     """Get all participants in a race with their bib, category, status, and time records"""
     try:
         session = get_session()
-        from models import Race, RaceResult, TimeRecord, race_participants as rp_table
-        from sqlalchemy import text
+        from models import Race, RaceResult, TimeRecord, Participant, race_participants as rp_table
+        from sqlalchemy import select, and_
 
         race = session.query(Race).get(race_id)
         if not race:
             return jsonify({'error': 'Race not found'}), 404
 
-        # Build participant list from race_participants association table
+        # Fetch registrations, participants and their results in one query
         rows = session.execute(
-            text("SELECT participant_id, bib_number, category FROM race_participants WHERE race_id = :rid"),
-            {'rid': race_id}
-        ).fetchall()
-
-        # Build a lookup of results keyed by participant_id
-        results_map = {}
-        for r in session.query(RaceResult).filter(RaceResult.race_id == race_id).all():
-            results_map[r.participant_id] = r
+            select(Participant, rp_table.c.bib_number, rp_table.c.category, RaceResult)
+            .select_from(rp_table)
+            .join(Participant, Participant.id == rp_table.c.participant_id)
+            .outerjoin(RaceResult, and_(
+                RaceResult.race_id == race_id,
+                RaceResult.participant_id == Participant.id
+            ))
+            .where(rp_table.c.race_id == race_id)
+        ).all()
 
         # Build a lookup of time records keyed by participant_id
         time_records_map = {}
@@ -860,17 +1135,13 @@ def get_race_participants(race_id):
                    .all()):
             time_records_map.setdefault(tr.participant_id, []).append(tr)
 
-        # Get timing points ordered
-        timing_points = sorted(race.timing_points, key=lambda tp: tp.order)
+        # Timing points are loaded already ordered by the relationship
+        timing_points = race.timing_points
 
-        participants_out = []
-        for row in rows:
-            from models import Participant
-            p = session.query(Participant).get(row.participant_id)
-            if not p:
-                continue
+        # Sort by bib number up front so rows can be streamed in order
+        rows = sorted(rows, key=lambda row: bib_sort_key(row.bib_number))
 
-            result = results_map.get(p.id)
+        def participant_json(p, bib_number, category, result):
             records = time_records_map.get(p.id, [])
 
             # Build splits: timing_point_name -> {timestamp, elapsed_seconds}
@@ -902,7 +1173,7 @@ def get_race_participants(race_id):
                         split_entry['split_seconds'] = (tr.timestamp - prev_ts).total_seconds()
                 splits.append(split_entry)
 
-            participants_out.append({
+            participant_data = {
                 'id': p.id,
                 'first_name': p.first_name,
                 'last_name': p.last_name,
@@ -912,18 +1183,37 @@ def get_race_participants(race_id):
                 'gender': p.gender,
                 'age': p.age,
                 'rfid_tag': p.rfid_tag,
-                'bib_number': row.bib_number,
-                'category': row.category,
+                'bib_number': bib_number,
+                'category': category,
                 'status': result.status.value if result and result.status else 'registered',
                 'total_time': result.total_time if result else None,
                 'overall_rank': result.overall_rank if result else None,
                 'splits': splits,
-            })
-
-        # Sort by bib number
-        participants_out.sort(key=lambda x: (x['bib_number'] or '').zfill(10))
+            }
+            return orjson.dumps(participant_data)
+
+        # Encode the first row before the response starts, so an early
+        # failure still returns a 500 instead of a truncated 200
+        first_row = participant_json(*rows[0]) if rows else None
+
+        def generate():
+            # Stream the JSON array one participant at a time instead of
+            # building the whole list (and its encoded copy) in memory
+            yield b'['
+            if first_row is None:
+                yield b']'
+                return
+            yield first_row
+            try:
+                for row in rows[1:]:
+                    yield b',' + participant_json(*row)
+            except Exception:
+                # Headers have been sent; log and end the array so the body
+                # is still valid JSON
+                logger.exception("Error streaming participants for race %s", race_id)
+            yield b']'
 
-        return jsonify(participants_out)
+        return Response(stream_with_context(generate()), mimetype='application/json')
 
     except Exception as e:
         import traceback
@@ -969,7 +1259,7 @@ def update_race_registration(race_id, participant_id):
 @app.route('/api/participants', methods=['GET'])
 def get_participants():
     """Get all participants"""
-    manager = ParticipantManager()
+    manager = get_participant_manager()
     race_id = request.args.get('race_id', type=int)
     participants = manager.list_participants(race_id)
     
@@ -989,7 +1279,7 @@ def get_participants():
 def create_participant():
     """Create a new participant"""
     data = request.json
-    manager = ParticipantManager()
+    manager = get_participant_manager()
     
     participant = manager.create_participant(
         first_name=data['first_name'],
@@ -1011,7 +1301,7 @@ def create_participant():
 def register_participant(participant_id):
     """Register participant for a race"""
     data = request.json
-    manager = ParticipantManager()
+    manager = get_participant_manager()
     
     manager.register_participant(
         race_id=data['race_id'],
@@ -1019,6 +1309,7 @@ def register_participant(participant_id):
         bib_number=data['bib_number'],
         category=data.get('category', 'Open')
     )
+    invalidate_race_cache(data['race_id'])
     
     return jsonify({'message': 'Participant registered successfully'})
 
@@ -1026,16 +1317,18 @@ def register_participant(participant_id):
 def update_participant(participant_id):
     """Update or delete participant information"""
     if request.method == 'DELETE':
-        manager = ParticipantManager()
+        manager = get_participant_manager()
         if manager.delete_participant(participant_id):
+            invalidate_race_cache()
             return jsonify({'message': 'Participant deleted successfully'})
         return jsonify({'error': 'Participant not found'}), 404
     
     # PUT method
     data = request.json
-    manager = ParticipantManager()
+    manager = get_participant_manager()
     
     if manager.update_participant(participant_id, **data):
+        invalidate_race_cache()
         return jsonify({'message': 'Participant updated successfully'})
     return jsonify({'error': 'Participant not found'}), 404
 
@@ -1043,9 +1336,10 @@ def update_participant(participant_id):
 def update_rfid(participant_id):
     """Update participant RFID tag"""
     data = request.json
-    manager = ParticipantManager()
+    manager = get_participant_manager()
     
     if manager.update_rfid_tag(participant_id, data['rfid_tag']):
+        invalidate_race_cache()
         return jsonify({'message': 'RFID tag updated successfully'})
     return jsonify({'error': 'Participant not found'}), 404
 
@@ -1065,53 +1359,25 @@ def import_participants():
     # Get optional race_id for registration
     race_id = request.form.get('race_id', type=int)
     
-    # Save file temporarily
-    import os
-    import tempfile
     from import_utils import import_participants_from_excel
     
-    temp_dir = tempfile.gettempdir()
-    temp_path = os.path.join(temp_dir, file.filename)
-    file.save(temp_path)
-    
     try:
-        result = import_participants_from_excel(temp_path, race_id)
-        os.remove(temp_path)  # Clean up
+        # Read the upload directly from the request stream (no temp file on disk)
+        result = import_participants_from_excel(file.stream, race_id)
+        # Imports can update existing participants in any race
+        invalidate_race_cache()
         
         if result['success']:
             return jsonify(result), 200
         else:
             return jsonify(result), 400
     except Exception as e:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/age-groups', methods=['GET'])
 def get_age_groups():
     """Get list of available age groups"""
-    from race_manager import get_age_group
-    
-    # Generate all standard age groups
-    age_groups = []
-    brackets = ["Under 20", "20-29", "30-39", "40-49", "50-59", "60+"]
-    genders = [("M", "Male"), ("F", "Female")]
-    
-    for gender_code, gender_name in genders:
-        for bracket in brackets:
-            age_groups.append({
-                'value': f"{gender_name} {bracket}",
-                'label': f"{gender_name} {bracket}"
-            })
-    
-    # Add non-gendered options
-    for bracket in brackets:
-        age_groups.append({
-            'value': bracket,
-            'label': bracket
-        })
-    
-    return jsonify(age_groups)
+    return Response(AGE_GROUPS_JSON, mimetype='application/json')
 
 
 # ============================================================================
@@ -1119,25 +1385,38 @@ def get_age_groups():
 # ============================================================================
 
 def load_llrp_config():
-    """Load LLRP configuration from file or return defaults."""
+    """Load LLRP configuration from file or return defaults.
+    
+    The parsed file is cached and reused until its modification time changes,
+    so repeated calls skip the open() and JSON parse.
+    """
     default_config = {
         "reader_ip": "192.168.1.100",
         "reader_port": 5084,
         "cooldown_seconds": 5
     }
     
-    if os.path.exists(LLRP_CONFIG_FILE):
-        try:
-            with open(LLRP_CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                # Merge with defaults to ensure all keys exist
-                default_config.update(config)
-                return default_config
-        except Exception as e:
-            print(f"Error loading LLRP config: {e}")
-            return default_config
+    try:
+        mtime = os.stat(LLRP_CONFIG_FILE).st_mtime_ns
+    except OSError:
+        return default_config
+    
+    if _llrp_cfg_cache['mtime'] == mtime:
+        return dict(_llrp_cfg_cache['data'])
     
-    return default_config
+    with _llrp_cfg_cache['lock']:
+        if _llrp_cfg_cache['mtime'] != mtime:
+            try:
+                with open(LLRP_CONFIG_FILE, 'r') as f:
+                    config = json.load(f)
+                    # Merge with defaults to ensure all keys exist
+                    default_config.update(config)
+            except Exception as e:
+                print(f"Error loading LLRP config: {e}")
+                return default_config
+            _llrp_cfg_cache['data'] = default_config
+            _llrp_cfg_cache['mtime'] = mtime
+        return dict(_llrp_cfg_cache['data'])
 
 
 def save_llrp_config(config):
@@ -1149,6 +1428,9 @@ def save_llrp_config(config):
     except Exception as e:
         print(f"Error saving LLRP config: {e}")
         return False
+    finally:
+        # Force the next load to re-read, even if the mtime has coarse resolution
+        _llrp_cfg_cache['mtime'] = None
 
 
 def emit_llrp_event(event_type, data):
@@ -1158,7 +1440,70 @@ def emit_llrp_event(event_type, data):
         'data': data,
         'timestamp': time.time()
     }
-    llrp_event_queue.put(event)
+    publish_llrp_event(event)
+
+
+def sse_frame(event):
+    """Encode an event as a complete SSE data frame"""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+
+def publish_llrp_event(event, critical=False):
+    """Fan an event out to every SSE subscriber without blocking the caller.
+    
+    The event is encoded once here and every subscriber queue receives the
+    same frame bytes.
+    
+    Non-critical events are dropped for a client that already has
+    LLRP_SUBSCRIBER_QUEUE_SIZE pending, so they never displace queued tag
+    reads. Critical events (tag reads) may use the full queue; a client that
+    lets it fill up is disconnected.
+    """
+    with llrp_subscribers_lock:
+        subscribers = list(llrp_subscribers)
+    if not subscribers:
+        return
+    
+    frame = sse_frame(event)
+    for q in subscribers:
+        if not critical and q.qsize() >= LLRP_SUBSCRIBER_QUEUE_SIZE:
+            # Client is behind; skip this status event for it
+            continue
+        try:
+            q.put_nowait(frame)
+        except queue.Full:
+            drop_llrp_subscriber(q)
+
+
+def drain_batch(q, first):
+    """Collect first plus any events arriving within the SSE coalescing window"""
+    batch = [first]
+    deadline = time.monotonic() + SSE_BATCH_WINDOW_SECONDS
+    while len(batch) < SSE_BATCH_MAX_EVENTS and first is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            event = q.get(timeout=remaining)
+        except queue.Empty:
+            break
+        batch.append(event)
+        if event is None:
+            break
+    return batch
+
+
+def drop_llrp_subscriber(q):
+    """Disconnect an SSE subscriber that has fallen too far behind"""
+    with llrp_subscribers_lock:
+        llrp_subscribers.discard(q)
+    # Discard its backlog and wake the generator with the close sentinel
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            break
+    q.put_nowait(None)
 
 
 def llrp_status_callback(message, level="info", station_id=None):
@@ -1180,17 +1525,18 @@ def llrp_tag_callback(epc, rssi, timestamp, station_id=None):
         'timestamp': timestamp,
         'station_id': station_id
     }
-    llrp_event_queue.put(('tag', event_data))
+    publish_llrp_event(('tag', event_data), critical=True)
     
-    # Pass to active race controls
-    # We iterate over a copy of values to avoid thread safety issues
-    for race_control in list(active_race_controls.values()):
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Tag read %s at %s from station %s", epc, timestamp, station_id)
+    # Pass only to race controls with a timing point on this station. Reads
+    # without a station_id match no timing point, so they are not dispatched.
+    for race_control in station_to_races.get(station_id, ()):
         try:
-            print("entering", epc, timestamp, station_id)
             # Pass station_id to race control
             race_control.process_tag_read(epc, timestamp, station_id)
-        except Exception as e:
-            print(f"Error processing tag in race control: {e}")
+        except Exception:
+            logger.exception("Error processing tag in race %s", race_control.race_id)
 
 
 @app.route('/api/llrp/config', methods=['GET'])
@@ -1206,8 +1552,6 @@ def get_llrp_config():
 @app.route('/api/llrp/config', methods=['POST'])
 def update_llrp_config():
     """Update LLRP configuration."""
-    global llrp_service
-    
     try:
         new_config = request.json
         
@@ -1217,10 +1561,9 @@ def update_llrp_config():
             if field not in new_config:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        # If service is running, don't allow config changes
-        with llrp_service_lock:
-            if llrp_service and llrp_service.is_running():
-                return jsonify({'error': 'Cannot update configuration while service is running'}), 400
+        # If any station service is running, don't allow config changes
+        if any(service.is_running() for service in list(active_llrp_services.values())):
+            return jsonify({'error': 'Cannot update configuration while service is running'}), 400
         
         # Save configuration
         if save_llrp_config(new_config):
@@ -1236,12 +1579,15 @@ def update_llrp_config():
 @app.route('/api/llrp-stations/<int:station_id>/start', methods=['POST'])
 def start_station_service(station_id):
     """Start a specific LLRP station service"""
-    manager = LLRPStationManager()
+    manager = get_llrp_station_manager()
     station_config = manager.get_station_config(station_id)
     
     if not station_config:
         return jsonify({'error': 'Station not found'}), 404
         
+    # Check-then-start must stay atomic so two requests can't both start the
+    # station. RFIDReaderService.start() only spawns the reader thread, so the
+    # lock is held briefly.
     with llrp_services_lock:
         if station_id in active_llrp_services and active_llrp_services[station_id].is_running():
             return jsonify({'error': 'Station service is already running'}), 400
@@ -1272,37 +1618,40 @@ def start_station_service(station_id):
 @app.route('/api/llrp-stations/<int:station_id>/stop', methods=['POST'])
 def stop_station_service(station_id):
     """Stop a specific LLRP station service"""
-    with llrp_services_lock:
-        service = active_llrp_services.get(station_id)
-        if not service:
-            return jsonify({'error': 'Station service is not running'}), 400
+    # pop() is atomic, so only one concurrent stop request gets the service;
+    # the rest no-op. The (up to 5s) thread join then runs without holding
+    # llrp_services_lock.
+    service = active_llrp_services.pop(station_id, None)
+    if not service:
+        return jsonify({'error': 'Station service is not running'}), 400
+        
+    try:
+        if service.stop():
+            # Update DB status
+            manager = get_llrp_station_manager()
+            manager.update_station_status(station_id, False)
             
-        try:
-            if service.stop():
-                del active_llrp_services[station_id]
-                
-                # Update DB status
-                manager = LLRPStationManager()
-                manager.update_station_status(station_id, False)
-                
-                emit_llrp_event('service_stopped', {
-                    'message': 'Station service stopped',
-                    'station_id': station_id
-                })
-                return jsonify({'success': True, 'message': 'Station service stopped'})
-            else:
-                return jsonify({'error': 'Failed to stop station service'}), 500
-                
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+            emit_llrp_event('service_stopped', {
+                'message': 'Station service stopped',
+                'station_id': station_id
+            })
+            return jsonify({'success': True, 'message': 'Station service stopped'})
+        else:
+            # Put it back unless a new service was started in the meantime
+            active_llrp_services.setdefault(station_id, service)
+            return jsonify({'error': 'Failed to stop station service'}), 500
+            
+    except Exception as e:
+        active_llrp_services.setdefault(station_id, service)
+        return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/llrp-stations/<int:station_id>/status', methods=['GET'])
 def get_station_status(station_id):
     """Get status of a specific station service"""
-    with llrp_services_lock:
-        service = active_llrp_services.get(station_id)
-        is_running = service.is_running() if service else False
+    # Single dict lookup; no lock needed
+    service = active_llrp_services.get(station_id)
+    is_running = service.is_running() if service else False
         
     return jsonify({
         'station_id': station_id,
@@ -1315,18 +1664,37 @@ def get_station_status(station_id):
 def llrp_events():
     """Server-Sent Events endpoint for real-time LLRP updates."""
     def generate():
-        # Send initial connection event
-        yield f"data: {json.dumps({'type': 'connected', 'timestamp': time.time()})}\n\n"
+        q = queue.Queue(maxsize=LLRP_SUBSCRIBER_TAG_QUEUE_SIZE)
+        with llrp_subscribers_lock:
+            llrp_subscribers.add(q)
         
-        # Stream events from the queue
-        while True:
-            try:
-                # Wait for an event with timeout
-                event = llrp_event_queue.get(timeout=30)
-                yield f"data: {json.dumps(event)}\n\n"
-            except queue.Empty:
-                # Send keepalive
-                yield f": keepalive\n\n"
+        try:
+            # Send initial connection event
+            yield sse_frame({'type': 'connected', 'timestamp': time.time()})
+            
+            # Stream events from this client's queue
+            while True:
+                try:
+                    # Wait for an event with timeout
+                    event = q.get(timeout=30)
+                except queue.Empty:
+                    # Send keepalive
+                    yield b": keepalive\n\n"
+                    continue
+                
+                # Write everything that arrived in the window as one chunk;
+                # frames were already encoded by publish_llrp_event
+                batch = drain_batch(q, event)
+                frames = b''.join(frame for frame in batch if frame is not None)
+                if frames:
+                    yield frames
+                
+                if batch[-1] is None:
+                    # Dropped for falling behind; the browser will reconnect
+                    return
+        finally:
+            with llrp_subscribers_lock:
+                llrp_subscribers.discard(q)
     
     return Response(generate(), mimetype='text/event-stream')
 
@@ -1339,48 +1707,46 @@ def llrp_events():
 def get_results(race_id):
     """Get race results"""
     # Verify race exists before creating control
-    manager = RaceManager()
-    if not manager.get_race(race_id):
+    if not race_exists(race_id):
         return jsonify({'error': f'Race {race_id} not found'}), 404
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
-    race_control = active_race_controls[race_id]
-    results = race_control.get_live_results()
-    return jsonify([{
-        'id': r.id,
-        'rank': r.overall_rank,
-        'bib_number': r.bib_number,
-        'participant': {
-            'id': r.participant.id,
-            'name': r.participant.full_name,
-            'gender': r.participant.gender,
-            'age': r.participant.age,
-            'category': r.category if hasattr(r, 'category') else None,
-            'status': r.status.value if hasattr(r, 'status') and r.status else None
-        },
-        'status': r.status.value if hasattr(r, 'status') and r.status else None,
-        'total_time': r.total_time,
-        'finish_time': r.finish_time.isoformat() if r.finish_time else None
-    } for r in results])
+    race_control = get_race_control(race_id)
+    
+    def build():
+        results = race_control.get_live_results(summary_only=True)
+        return orjson.dumps([{
+            'id': r.id,
+            'rank': r.overall_rank,
+            'bib_number': r.bib_number,
+            'participant': {
+                'id': r.participant.id,
+                'name': r.participant.full_name,
+                'gender': r.participant.gender,
+                'age': r.participant.age,
+                'category': r.category if hasattr(r, 'category') else None,
+                'status': r.status.value if hasattr(r, 'status') and r.status else None
+            },
+            'status': r.status.value if hasattr(r, 'status') and r.status else None,
+            'total_time': r.total_time,
+            'finish_time': r.finish_time
+        } for r in results])
+    
+    body = cached_results((race_id, 'results', race_control.version), build)
+    return Response(body, mimetype='application/json')
 @app.route('/api/races/<int:race_id>/control/start-llrp', methods=['POST'])
 def start_llrp(race_id):
     """Start LLRP timing for a race"""
-    manager = RaceManager()
-    race = manager.get_race(race_id)
-    if not race:
-        return jsonify({'error': f'Race {race_id} not found'}), 404
+    session = get_session()
     try:
-        if race_id in active_race_controls:
-            active_race_controls[race_id].start_timing()
-        else:
-            race_control = RaceControl(race_id)
-            race_control.start_timing()
-            active_race_controls[race_id] = race_control
-        
-        # Persist LLRP enabled state
-        session = get_session()
-        race.llrp_enabled = True
+        # Persist LLRP enabled state; the row count doubles as the existence check
+        updated = session.query(Race).filter(Race.id == race_id).update(
+            {Race.llrp_enabled: True}, synchronize_session=False
+        )
         session.commit()
+        if not updated:
+            return jsonify({'error': f'Race {race_id} not found'}), 404
+        invalidate_race_cache(race_id)
+        
+        get_race_control(race_id).start_timing()
         
         return jsonify({'message': 'Race timing enabled'})
     except Exception as e:
@@ -1389,19 +1755,20 @@ def start_llrp(race_id):
 @app.route('/api/races/<int:race_id>/control/stop-llrp', methods=['POST'])
 def stop_llrp(race_id):
     """Stop LLRP timing for a race"""
-    manager = RaceManager()
-    race = manager.get_race(race_id)
-    if not race:
+    # Persist LLRP disabled state; the row count doubles as the existence check
+    session = get_session()
+    updated = session.query(Race).filter(Race.id == race_id).update(
+        {Race.llrp_enabled: False}, synchronize_session=False
+    )
+    session.commit()
+    if not updated:
         return jsonify({'error': f'Race {race_id} not found'}), 404
+    invalidate_race_cache(race_id)
     
     if race_id in active_race_controls:
         active_race_controls[race_id].stop_timing()
-        del active_race_controls[race_id]
-    
-    # Persist LLRP disabled state
-    session = get_session()
-    race.llrp_enabled = False
-    session.commit()
+        active_race_controls.pop(race_id).close()
+        rebuild_tag_dispatch()
     
     return jsonify({'message': 'Race timing disabled'})
 
@@ -1411,10 +1778,7 @@ def record_time(race_id):
     data = request.json
     
     # Get or create race control
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
-    
-    race_control = active_race_controls[race_id]
+    race_control = get_race_control(race_id)
     
     timestamp = datetime.fromisoformat(data['timestamp']) if 'timestamp' in data else None
     
@@ -1435,10 +1799,7 @@ def record_time_auto(race_id):
     data = request.json
     
     # Get or create race control
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
-    
-    race_control = active_race_controls[race_id]
+    race_control = get_race_control(race_id)
     
     timestamp = datetime.fromisoformat(data['timestamp']) if 'timestamp' in data else None
     
@@ -1457,11 +1818,8 @@ def mark_dnf(race_id):
     """Mark participant as DNF"""
     data = request.json
     
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
-    
-    race_control = active_race_controls[race_id]
-    participant = race_control.participant_manager.get_participant_by_bib(race_id, data['bib_number'])
+    race_control = get_race_control(race_id)
+    participant = get_participant_manager().get_participant_by_bib(race_id, data['bib_number'])
     
     if participant:
         race_control.mark_dnf(participant.id, data.get('notes'))
@@ -1473,11 +1831,8 @@ def mark_dns(race_id):
     """Mark participant as DNS"""
     data = request.json
     
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
-    
-    race_control = active_race_controls[race_id]
-    participant = race_control.participant_manager.get_participant_by_bib(race_id, data['bib_number'])
+    race_control = get_race_control(race_id)
+    participant = get_participant_manager().get_participant_by_bib(race_id, data['bib_number'])
     
     if participant:
         race_control.mark_dns(participant.id, data.get('notes'))
@@ -1507,6 +1862,8 @@ def update_result(result_id):
         result.status = ParticipantStatus(data['status'])
     
     session.commit()
+    drop_results_cache(result.race_id)
+    notify_race(result.race_id)
     return jsonify({'message': 'Result updated successfully'})
 
 @app.route('/api/results/<int:result_id>', methods=['DELETE'])
@@ -1519,8 +1876,11 @@ def delete_result(result_id):
     if not result:
         return jsonify({'error': 'Result not found'}), 404
     
+    race_id = result.race_id
     session.delete(result)
     session.commit()
+    drop_results_cache(race_id)
+    notify_race(race_id)
     return jsonify({'message': 'Result deleted successfully'})
 
 @app.route('/api/races/<int:race_id>/time-records', methods=['GET'])
@@ -1529,26 +1889,44 @@ def get_time_records(race_id):
     session = get_session()
     from models import TimeRecord, Participant, TimingPoint
     
-    records = session.query(TimeRecord).filter(
+    # One JOINed query instead of a SELECT per row for each relationship;
+    # ordering is backed by the (race_id, timestamp) index
+    records = session.query(TimeRecord).options(
+        joinedload(TimeRecord.participant),
+        joinedload(TimeRecord.timing_point)
+    ).filter(
         TimeRecord.race_id == race_id
     ).order_by(TimeRecord.timestamp.desc()).all()
     
-    return jsonify([{
-        'id': r.id,
-        'participant': {
-            'id': r.participant.id,
-            'name': r.participant.full_name,
-            'rfid_tag': r.participant.rfid_tag
-        },
-        'timing_point': {
-            'id': r.timing_point.id,
-            'name': r.timing_point.name,
-            'order': r.timing_point.order
-        },
-        'timestamp': r.timestamp.isoformat(),
-        'source': r.source.value,
-        'notes': r.notes
-    } for r in records])
+    # Each participant/timing point appears on many records; build their dicts once
+    participants = {}
+    timing_points = {}
+    data = []
+    for r in records:
+        participant = participants.get(r.participant_id)
+        if participant is None:
+            participant = participants[r.participant_id] = {
+                'id': r.participant.id,
+                'name': r.participant.full_name,
+                'rfid_tag': r.participant.rfid_tag
+            }
+        timing_point = timing_points.get(r.timing_point_id)
+        if timing_point is None:
+            timing_point = timing_points[r.timing_point_id] = {
+                'id': r.timing_point.id,
+                'name': r.timing_point.name,
+                'order': r.timing_point.order
+            }
+        data.append({
+            'id': r.id,
+            'participant': participant,
+            'timing_point': timing_point,
+            'timestamp': r.timestamp,
+            'source': r.source.value,
+            'notes': r.notes
+        })
+    
+    return jsonify(data)
 
 @app.route('/api/races/<int:race_id>/time-records', methods=['POST'])
 def create_time_record(race_id):
@@ -1569,11 +1947,8 @@ def create_time_record(race_id):
         session.add(record)
         session.commit()
         
-        # Trigger recalculation
-        if race_id not in active_race_controls:
-            active_race_controls[race_id] = RaceControl(race_id)
-        
-        active_race_controls[race_id].calculate_results()
+        # Recalculate before responding: the UI refetches results straight away
+        get_race_control(race_id).calculate_results()
         
         return jsonify({
             'id': record.id,
@@ -1604,11 +1979,8 @@ def update_time_record(record_id):
         
         session.commit()
         
-        # Trigger recalculation
-        if record.race_id not in active_race_controls:
-            active_race_controls[record.race_id] = RaceControl(record.race_id)
-        
-        active_race_controls[record.race_id].calculate_results()
+        # Recalculate before responding: the UI refetches results straight away
+        get_race_control(record.race_id).calculate_results()
         
         return jsonify({'message': 'Time record updated successfully'})
     except Exception as e:
@@ -1629,21 +2001,16 @@ def delete_time_record(record_id):
     session.delete(record)
     session.commit()
     
-    # Trigger recalculation
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
-    
-    active_race_controls[race_id].calculate_results()
+    # Recalculate before responding: the UI refetches results straight away
+    get_race_control(race_id).calculate_results()
     
     return jsonify({'message': 'Time record deleted successfully'})
 
 @app.route('/api/races/<int:race_id>/recalculate', methods=['POST'])
 def recalculate_results(race_id):
     """Manually trigger result recalculation"""
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
-    
-    active_race_controls[race_id].calculate_results()
+    # Synchronous: the UI refreshes results as soon as this returns
+    get_race_control(race_id).calculate_results()
     return jsonify({'message': 'Results recalculated successfully'})
 
 
@@ -1654,11 +2021,33 @@ def get_leaderboard(race_id):
     gender = request.args.get('gender', None)
     age_group = request.args.get('age_group', None)
     
-    if race_id not in active_race_controls:
-        active_race_controls[race_id] = RaceControl(race_id)
+    race_control = get_race_control(race_id)
+    key = (race_id, 'leaderboard', limit, gender, age_group, race_control.version)
+    rows, start_times = cached_results(key, lambda: build_leaderboard_rows(race_control, limit, gender, age_group))
     
-    race_control = active_race_controls[race_id]
-    results = race_control.get_live_results(limit=None)  # Get all, we'll filter
+    # Elapsed time for active racers changes every second, so it is computed
+    # per request rather than cached: one vectorized subtract for all rows
+    current_time = np.datetime64(datetime.utcnow(), 'us')
+    elapsed = ((current_time - start_times) / np.timedelta64(1, 's')).tolist()
+    response_data = []
+    for row, current_elapsed in zip(rows, elapsed):
+        if math.isnan(current_elapsed):
+            current_elapsed = None
+        response_data.append(dict(
+            row,
+            current_elapsed=current_elapsed,
+            current_elapsed_formatted=format_time(current_elapsed) if current_elapsed else None
+        ))
+    
+    return jsonify(response_data)
+
+def build_leaderboard_rows(race_control, limit, gender, age_group):
+    """Build leaderboard rows plus a datetime64 array of their start times.
+    
+    Start times are set only for racers still on course (NaT otherwise), for
+    the live elapsed time.
+    """
+    results = race_control.get_live_results(limit=None, summary_only=True)  # Get all, we'll filter
     
     # Filter to finished and started participants (those with ranks)
     active_results = [r for r in results if r.status in [ParticipantStatus.FINISHED, ParticipantStatus.STARTED]]
@@ -1678,32 +2067,14 @@ def get_leaderboard(race_id):
     if limit:
         active_results = active_results[:limit]
     
-    # Get current time for elapsed time calculation
-    current_time = datetime.utcnow()
-    
     # Build response with checkpoint data
-    response_data = []
+    rows = []
+    start_times = np.array([
+        r.start_time if r.status == ParticipantStatus.STARTED and r.start_time else np.datetime64('NaT')
+        for r in active_results
+    ], dtype='datetime64[us]')
     for r in active_results:
-        # Parse split times to find last checkpoint
-        last_checkpoint_name = None
-        last_checkpoint_time = None
-        
-        if r.split_times:
-            try:
-                splits = json.loads(r.split_times)
-                if splits:
-                    # Get the last checkpoint (most recent)
-                    last_checkpoint_name = list(splits.keys())[-1]
-                    last_checkpoint_time = splits[last_checkpoint_name]
-            except:
-                pass
-        
-        # Calculate current elapsed time for active racers
-        current_elapsed = None
-        if r.status == ParticipantStatus.STARTED and r.start_time:
-            current_elapsed = (current_time - r.start_time).total_seconds()
-        
-        response_data.append({
+        rows.append({
             'rank': r.overall_rank,
             'bib_number': r.bib_number,
             'name': r.participant.full_name,
@@ -1713,51 +2084,104 @@ def get_leaderboard(race_id):
             'status': r.status.value,
             'total_time': r.total_time,
             'total_time_formatted': format_time(r.total_time) if r.total_time else None,
-            'current_elapsed': current_elapsed,
-            'current_elapsed_formatted': format_time(current_elapsed) if current_elapsed else None,
-            'last_checkpoint_name': last_checkpoint_name,
-            'last_checkpoint_time': last_checkpoint_time
+            'last_checkpoint_name': r.last_checkpoint_name,
+            'last_checkpoint_time': r.last_checkpoint_time
         })
     
-    return jsonify(response_data)
+    return rows, start_times
 
 @app.route('/api/races/<int:race_id>/stream')
 def stream_updates(race_id):
     """Server-Sent Events stream for live updates"""
     def generate():
-        while True:
-            # Get latest results
-            if race_id in active_race_controls:
-                race_control = active_race_controls[race_id]
-                results = race_control.get_live_results(limit=10)
-                
-                data = [{
-                    'rank': r.overall_rank,
-                    'bib': r.bib_number,
-                    'name': r.participant.full_name,
-                    'time': format_time(r.total_time) if r.total_time else '-',
-                    'status': r.status.value
-                } for r in results]
-                
-                yield f"data: {json.dumps(data)}\n\n"
+        q = queue.Queue(maxsize=1)
+        with race_update_lock:
+            race_update_subscribers.setdefault(race_id, set()).add(q)
+        
+        try:
+            # Ask EventSource to wait 10s before reconnecting, so a server
+            # restart doesn't get hit by every client at once
+            yield "retry: 10000\n\n"
             
-            time.sleep(5)  # Update every 5 seconds
-    
-    return Response(generate(), mimetype='text/event-stream')
+            changed = True  # Send the current standings straight away
+            while True:
+                if changed and race_id in active_race_controls:
+                    race_control = active_race_controls[race_id]
+                    results = race_control.get_live_results(limit=10, summary_only=True)
+                    
+                    data = [{
+                        'rank': r.overall_rank,
+                        'bib': r.bib_number,
+                        'name': r.participant.full_name,
+                        'time': format_time(r.total_time) if r.total_time else '-',
+                        'status': r.status.value
+                    } for r in results]
+                    # Release the connection (and stale identity map) while idle
+                    close_session()
+                    
+                    yield f"data: {json.dumps(data)}\n\n"
+                
+                # Block until results change, sending a keepalive if they don't
+                try:
+                    q.get(timeout=25)
+                    changed = True
+                except queue.Empty:
+                    changed = False
+                    yield ": keepalive\n\n"
+        finally:
+            with race_update_lock:
+                subscribers = race_update_subscribers.get(race_id)
+                if subscribers is not None:
+                    subscribers.discard(q)
+                    if not subscribers:
+                        del race_update_subscribers[race_id]
+    
+    stream = generate()
+    headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.accept_encodings:
+        # Rows repeat the same keys every update, so they compress well
+        stream = gzip_stream(stream)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream, mimetype='text/event-stream', headers=headers)
+
+
+def gzip_stream(chunks):
+    """Gzip a streamed response, flushing after each chunk so events aren't held back"""
+    gz = zlib.compressobj(1, zlib.DEFLATED, 31)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield gz.compress(chunk) + gz.flush(zlib.Z_SYNC_FLUSH)
+        yield gz.flush()
+    finally:
+        # Close the wrapped generator too so its cleanup runs on disconnect
+        chunks.close()
 
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+def bib_sort_key(bib_number):
+    """Sort key that orders numeric bibs as integers, followed by any non-numeric bibs"""
+    if bib_number and bib_number.isdigit():
+        return (0, int(bib_number), '')
+    return (1, 0, bib_number or '')
+
+
 def format_time(seconds):
     """Format seconds as HH:MM:SS or MM:SS"""
     if seconds is None:
         return "N/A"
-    
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    return _format_whole_seconds(math.floor(seconds))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_whole_seconds(seconds):
+    """format_time for whole seconds; many results share the same value, so memoized"""
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
     
     if hours > 0:
         return f"{hours}:{minutes:02d}:{secs:02d}"
@@ -1774,7 +2198,7 @@ def publish_race_results(race_id):
     """Publish race results to the public results site"""
     from results_publisher import ResultsPublisher
     
-    manager = RaceManager()
+    manager = get_race_manager()
     race = manager.get_race(race_id)
     if not race:
         return jsonify({'error': f'Race {race_id} not found'}), 404
@@ -1821,19 +2245,30 @@ def publish_event_results(event_id):
         if not event:
             return jsonify({'error': 'Event not found'}), 404
         
-        published_count = 0
-        errors = []
-        race_count = len(event.races)
+        races = [(race.id, race.name) for race in event.races]
+        race_count = len(races)
         publisher = ResultsPublisher()
         
-        for race in event.races:
+        # Publish the event once up front rather than once per race
+        publisher.publish_event(event_id)
+        
+        def publish_race_results(race):
+            race_id, race_name = race
             try:
-                if publisher.publish_results(race.id, publish_type='manual', published_by='admin'):
-                    published_count += 1
-                else:
-                    errors.append(f"Race {race.name}: publish_results returned False")
+                if publisher.publish_results(race_id, publish_type='manual', published_by='admin', include_event=False):
+                    return None
+                return f"Race {race_name}: publish_results returned False"
             except Exception as e:
-                errors.append(f"Race {race.name}: {str(e)}")
+                return f"Race {race_name}: {str(e)}"
+            finally:
+                close_session()
+        
+        # Each publish is dominated by webhook round-trips, so run them concurrently
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outcomes = list(executor.map(publish_race_results, races))
+        
+        errors = [outcome for outcome in outcomes if outcome]
+        published_count = race_count - len(errors)
         
         if published_count == 0 and errors:
             return jsonify({
@@ -1856,41 +2291,54 @@ def publish_event_results(event_id):
         session.close()
 
 
+@functools.lru_cache(maxsize=256)
+def _qr_png(url):
+    """Render a QR code PNG for url. Output is deterministic, so it is memoized."""
+    import qrcode
+    from io import BytesIO
+    
+    # Create QR code
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    
+    # Create image
+    img = qr.make_image(fill_color="black", back_color="white")
+    
+    # Save to bytes
+    img_io = BytesIO()
+    img.save(img_io, 'PNG')
+    return img_io.getvalue()
+
+
+def qr_response(url):
+    """PNG response for url's QR code, answering If-None-Match with 304"""
+    png = _qr_png(url)
+    response = Response(png, mimetype='image/png')
+    # The image only changes if results_publish_url does, so browsers may
+    # reuse it for an hour and revalidate cheaply via the ETag after that
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    response.set_etag(hashlib.md5(png).hexdigest())
+    return response.make_conditional(request)
+
+
 @app.route('/api/races/<int:race_id>/qrcode')
 def race_qrcode(race_id):
     """Generate QR code for race results page"""
     try:
-        import qrcode
-        from io import BytesIO
-        
-        # Get race to verify it exists
-        race_manager = RaceManager()
-        race = race_manager.get_race(race_id)
-        if not race:
+        # Verify race exists
+        if not race_exists(race_id):
             return jsonify({'error': 'Race not found'}), 404
         
         # Generate URL for public results
         public_url = f"{get_config_manager().get('results_publish_url', 'http://localhost:5002')}/race/{race_id}"
         
-        # Create QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(public_url)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to bytes
-        img_io = BytesIO()
-        img.save(img_io, 'PNG')
-        img_io.seek(0)
-        
-        return Response(img_io.getvalue(), mimetype='image/png')
+        return qr_response(public_url)
         
     except ImportError:
         return jsonify({'error': 'QR code library not installed. Run: pip install qrcode[pil]'}), 500
@@ -1902,11 +2350,8 @@ def race_qrcode(race_id):
 def event_qrcode(event_id):
     """Generate QR code for event results page"""
     try:
-        import qrcode
-        from io import BytesIO
-        
         # Get event to verify it exists
-        event_manager = EventManager()
+        event_manager = get_event_manager()
         event = event_manager.get_event(event_id)
         if not event:
             return jsonify({'error': 'Event not found'}), 404
@@ -1914,25 +2359,7 @@ def event_qrcode(event_id):
         # Generate URL for public results
         public_url = f"{get_config_manager().get('results_publish_url', 'http://localhost:5002')}/event/{event_id}"
         
-        # Create QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(public_url)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to bytes
-        img_io = BytesIO()
-        img.save(img_io, 'PNG')
-        img_io.seek(0)
-        
-        return Response(img_io.getvalue(), mimetype='image/png')
+        return qr_response(public_url)
         
     except ImportError:
         return jsonify({'error': 'QR code library not installed. Run: pip install qrcode[pil]'}), 500
@@ -1945,6 +2372,121 @@ def event_qrcode(event_id):
 # SYSTEM CONFIGURATION
 # ============================================================================
 
+# psycopg2 pool for the setup/config connection probes, rebuilt whenever the
+# db_* settings it was created from change
+_DB_POOL = None
+_DB_POOL_SETTINGS = None
+_db_pool_lock = threading.Lock()
+
+
+# Runs the connection tests from the system config page, so a request thread
+# waits at most the probe's own timeout (plus a second) for an unreachable host
+_PROBE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='config-probe')
+DB_CONNECT_TIMEOUT = 3
+
+
+DB_SETTING_KEYS = ['db_host', 'db_port', 'db_name', 'db_user', 'db_password']
+
+
+def get_db_settings(config_mgr):
+    """Current database settings as (host, port, name, user, password)"""
+    values = config_mgr.get_many(DB_SETTING_KEYS)
+    try:
+        db_port = int(values.get('db_port') or 5432)
+    except (ValueError, TypeError):
+        db_port = 5432
+    return (
+        values.get('db_host', 'localhost'),
+        db_port,
+        values.get('db_name', 'race_timing'),
+        values.get('db_user', 'postgres'),
+        values.get('db_password', '')
+    )
+
+
+def get_db_pool(settings):
+    """Get the connection pool for settings, replacing the pool if they changed"""
+    global _DB_POOL, _DB_POOL_SETTINGS
+    with _db_pool_lock:
+        if _DB_POOL is None or _DB_POOL_SETTINGS != settings:
+            db_host, db_port, db_name, db_user, db_password = settings
+            pool = _pg_pool.ThreadedConnectionPool(
+                minconn=1,
+                maxconn=4,
+                host=db_host,
+                port=db_port,
+                database=db_name,
+                user=db_user,
+                password=db_password,
+                connect_timeout=DB_CONNECT_TIMEOUT
+            )
+            if _DB_POOL is not None:
+                _DB_POOL.closeall()
+            _DB_POOL, _DB_POOL_SETTINGS = pool, settings
+        return _DB_POOL
+
+
+def reset_db_pool():
+    """Close the probe pool; the next get_db_pool() reconnects with current settings"""
+    global _DB_POOL, _DB_POOL_SETTINGS
+    with _db_pool_lock:
+        if _DB_POOL is not None:
+            _DB_POOL.closeall()
+        _DB_POOL, _DB_POOL_SETTINGS = None, None
+
+
+@contextmanager
+def get_db_conn(settings):
+    """Borrow a pooled psycopg2 connection for settings"""
+    pool = get_db_pool(settings)
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+    except Exception:
+        # Don't return a connection that may be dead to the pool
+        broken = True
+        raise
+    finally:
+        if pool.closed:
+            conn.close()
+        else:
+            pool.putconn(conn, close=broken)
+
+
+def probe_database(settings):
+    """Run SELECT 1 on a pooled connection; raises if the database is unreachable"""
+    with get_db_conn(settings) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        conn.rollback()
+
+
+def test_database_login(settings):
+    """Log in with a fresh psycopg2 connection and run SELECT 1; raises on failure.
+    
+    Unlike probe_database() this never reuses a pooled connection, so it
+    checks that the server accepts the current credentials right now.
+    """
+    db_host, db_port, db_name, db_user, db_password = settings
+    conn = psycopg2.connect(
+        host=db_host,
+        port=db_port,
+        database=db_name,
+        user=db_user,
+        password=db_password,
+        connect_timeout=DB_CONNECT_TIMEOUT
+    )
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    finally:
+        conn.close()
+
+
+atexit.register(reset_db_pool)
+
+
 @app.route('/system-config')
 def system_config_page():
     """System configuration page"""
@@ -1955,16 +2497,21 @@ def system_config_page():
 def get_system_config():
     """Get all system configuration"""
     try:
+        global system_config_cache
         config_mgr = get_config_manager()
-        configs = config_mgr.get_all()
-        
-        # Convert to simple key-value dict for frontend
-        config_dict = {}
-        for config in configs:
-            # Don't send actual sensitive values, frontend will show masked
-            config_dict[config['key']] = config['value']
         
-        return jsonify(config_dict)
+        cached = system_config_cache
+        if cached is None or cached[0] != config_mgr.version:
+            version = config_mgr.version
+            # Simple key-value dict for frontend; sensitive values come back masked
+            body = orjson.dumps(config_mgr.get_values())
+            cached = (version, hashlib.blake2b(body, digest_size=8).hexdigest(), body)
+            system_config_cache = cached
+        
+        _, etag, body = cached
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1978,18 +2525,24 @@ def update_system_config():
             return jsonify({'error': 'No data provided'}), 400
         
         config_mgr = get_config_manager()
-        result = config_mgr.update_multiple(data, updated_by='admin')
-        
+        # Only write keys whose value actually changed
+        changed = config_mgr.changed_values(data)
+        result = config_mgr.update_multiple(changed, updated_by='admin')
+        if any(key.startswith('db_') for key in changed):
+            invalidate_db_status()
+        
+        # Unchanged keys count as successfully updated
+        success = result['success'] + len(data) - len(changed)
         if result['errors']:
             return jsonify({
                 'success': False,
-                'message': f"Updated {result['success']} of {result['total']} settings",
+                'message': f"Updated {success} of {len(data)} settings",
                 'errors': result['errors']
             }), 400
         
         return jsonify({
             'success': True,
-            'message': f"Successfully updated {result['success']} settings"
+            'message': f"Successfully updated {success} settings"
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -2001,29 +2554,19 @@ def test_database_connection():
     try:
         config_mgr = get_config_manager()
         
-        # Get database settings
-        db_host = config_mgr.get('db_host', 'localhost')
-        db_port = config_mgr.get_int('db_port', 5432)
-        db_name = config_mgr.get('db_name', 'race_timing')
-        db_user = config_mgr.get('db_user', 'postgres')
-        db_password = config_mgr.get('db_password', '')
-        
-        # Try to connect
-        import psycopg2
-        conn = psycopg2.connect(
-            host=db_host,
-            port=db_port,
-            database=db_name,
-            user=db_user,
-            password=db_password,
-            connect_timeout=5
-        )
-        conn.close()
+        # Try a query with the current database settings
+        future = _PROBE_POOL.submit(test_database_login, get_db_settings(config_mgr))
+        future.result(timeout=DB_CONNECT_TIMEOUT + 1)
         
         return jsonify({
             'success': True,
             'message': 'Database connection successful'
         })
+    except FutureTimeoutError:
+        return jsonify({
+            'success': False,
+            'error': 'Database connection timed out'
+        }), 504
     except Exception as e:
         return jsonify({
             'success': False,
@@ -2038,20 +2581,28 @@ def test_webhook_connection():
         config_mgr = get_config_manager()
         
         # Get webhook settings
-        webhook_url = config_mgr.get('results_publish_url', 'http://localhost:5002')
-        webhook_secret = config_mgr.get('webhook_secret', '')
-        timeout = config_mgr.get_int('webhook_timeout', 10)
+        values = config_mgr.get_many(['results_publish_url', 'webhook_timeout'])
+        webhook_url = values.get('results_publish_url', 'http://localhost:5002')
+        try:
+            timeout = int(values.get('webhook_timeout') or 10)
+        except (ValueError, TypeError):
+            timeout = 10
         
         # Test ping endpoint
         ping_url = f"{webhook_url}/ping"
-        response = requests.get(ping_url, timeout=timeout)
-        response.raise_for_status()
+        future = _PROBE_POOL.submit(_ping_webhook, ping_url, timeout)
         
         return jsonify({
             'success': True,
             'message': 'Webhook connection successful',
-            'response': response.json()
+            # One attempt: up to timeout to connect plus timeout to read
+            'response': future.result(timeout=2 * timeout + 1)
         })
+    except FutureTimeoutError:
+        return jsonify({
+            'success': False,
+            'error': 'Webhook connection timed out'
+        }), 504
     except Exception as e:
         return jsonify({
             'success': False,
@@ -2059,12 +2610,20 @@ def test_webhook_connection():
         }), 400
 
 
+def _ping_webhook(ping_url, timeout):
+    """GET the results site's ping endpoint and return its JSON body"""
+    response = _http_session().get(ping_url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
 @app.route('/api/system-config/reset/<category>', methods=['POST'])
 def reset_config_category(category):
     """Reset configuration category to defaults"""
     try:
         config_mgr = get_config_manager()
         count = config_mgr.reset_to_defaults(category)
+        invalidate_db_status()
         
         return jsonify({
             'success': True,
@@ -2077,53 +2636,126 @@ def reset_config_category(category):
 # SETUP WIZARD
 # ============================================================================
 
+# Last check_database_configured() result. After the first probe a background
+# thread refreshes it every _DB_OK_TTL seconds, so page views never wait on
+# the database. 'generation' is bumped by invalidate_db_status() so a refresh
+# that raced with a settings change doesn't overwrite the reset.
+_db_ok_cache = {'value': None, 'generation': 0}
+_DB_OK_TTL = 30.0
+_DB_TCP_PROBE_TIMEOUT = 0.5
+_db_refresher = None
+_db_refresher_lock = threading.Lock()
+
+
+def invalidate_db_status():
+    """Force the next check_database_configured() to probe the database again"""
+    global _SETUP_DONE
+    _db_ok_cache['generation'] += 1
+    _db_ok_cache['value'] = None
+    _SETUP_DONE = False
+
+
 def check_database_configured():
     """Check if database is properly configured and accessible"""
+    configured = _db_ok_cache['value']
+    if configured is None:
+        # No answer yet (first call, or settings changed): probe inline
+        configured = _refresh_db_status()
+        _start_db_refresher()
+    return configured
+
+
+def _refresh_db_status():
+    """Probe the database and store the result in _db_ok_cache"""
+    generation = _db_ok_cache['generation']
+    configured = None
+    if _db_ok_cache['value']:
+        # Previously verified and settings unchanged: checking the port is
+        # still open is enough to refresh, without a login round-trip
+        db_host, db_port = get_db_settings(get_config_manager())[:2]
+        if _tcp_probe(db_host, db_port, timeout=_DB_TCP_PROBE_TIMEOUT):
+            configured = True
+    if configured is None:
+        configured = _probe_database_configured()
+    if _db_ok_cache['generation'] == generation:
+        _db_ok_cache['value'] = configured
+    return configured
+
+
+def _start_db_refresher():
+    """Start the background database status refresher, once per process"""
+    global _db_refresher
+    with _db_refresher_lock:
+        if _db_refresher is None:
+            _db_refresher = threading.Thread(
+                target=_db_refresher_loop,
+                name='db-status-refresher',
+                daemon=True
+            )
+            _db_refresher.start()
+
+
+def _db_refresher_loop():
+    """Re-probe the database every _DB_OK_TTL seconds"""
+    while True:
+        time.sleep(_DB_OK_TTL)
+        try:
+            _refresh_db_status()
+        except Exception as e:
+            print(f"Error refreshing database status: {e}")
+        finally:
+            # This thread lives forever; don't hold a session between probes
+            close_session()
+
+
+def _tcp_probe(host, port, timeout=1.0):
+    """Check that host:port accepts TCP connections"""
+    try:
+        with socket.create_connection((host, port), timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _probe_database_configured():
+    """Uncached check_database_configured()"""
     try:
         config_mgr = get_config_manager()
         
         # Check if we have database configuration
-        db_host = config_mgr.get('db_host')
-        db_name = config_mgr.get('db_name')
-        db_user = config_mgr.get('db_user')
+        values = config_mgr.get_many(DB_SETTING_KEYS)
         
-        if not all([db_host, db_name, db_user]):
+        if not all(values.get(key) for key in ('db_host', 'db_name', 'db_user')):
             return False
         
-        # Try to connect to database
-        import psycopg2
-        db_port = config_mgr.get_int('db_port', 5432)
-        db_password = config_mgr.get('db_password', '')
-        
-        conn = psycopg2.connect(
-            host=db_host,
-            port=db_port,
-            database=db_name,
-            user=db_user,
-            password=db_password,
-            connect_timeout=3
-        )
-        conn.close()
+        # Try a query on a pooled connection to the database
+        probe_database(get_db_settings(config_mgr))
         return True
     except Exception:
         return False
 
 
+# Paths check_setup never redirects, most frequently requested first
+_SKIP_PREFIXES = ('/api/', '/static', '/setup')
+
+# Set once the database has been seen configured; check_setup then stops
+# probing until the database settings change (see invalidate_db_status)
+_SETUP_DONE = False
+
+
 @app.before_request
 def check_setup():
     """Redirect to setup wizard if database is not configured"""
     # Skip check for setup wizard, static files, and API endpoints
-    if (request.path.startswith('/setup') or
-        request.path.startswith('/static') or
-        request.path.startswith('/api/')):
+    global _SETUP_DONE
+    if _SETUP_DONE or request.path.startswith(_SKIP_PREFIXES):
         return None
     
-    # Check if database is configured
+    # Check if database is configured (the setup page itself is skipped above)
     if not check_database_configured():
-        # Check if this is already the setup page
-        if request.path != '/setup':
-            return redirect('/setup')
+        return redirect('/setup')
     
+    _SETUP_DONE = True
     return None
 
 
@@ -2133,27 +2765,76 @@ def setup_wizard():
     return render_template('setup_wizard.html')
 
 
+# Settings the setup wizard saves; the database ones are all required
+SETUP_DATABASE_FIELDS = ['db_host', 'db_port', 'db_name', 'db_user', 'db_password']
+SETUP_WEBHOOK_FIELDS = ['results_publish_url', 'webhook_secret', 'webhook_timeout', 'webhook_retry_attempts']
+
+
+@app.route('/api/setup', methods=['POST'])
+def setup_all():
+    """Save database and webhook configuration in one request and report setup status
+    
+    Expects {"database": {...}, "webhook": {...}}; "webhook" is optional.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        database = data.get('database') or {}
+        webhook = data.get('webhook') or {}
+        if not isinstance(database, dict) or not isinstance(webhook, dict):
+            return jsonify({'error': 'database and webhook must be objects'}), 400
+        if not all(field in database for field in SETUP_DATABASE_FIELDS):
+            return jsonify({'error': 'Missing required database fields'}), 400
+        
+        settings = {field: database[field] for field in SETUP_DATABASE_FIELDS}
+        settings.update({field: webhook[field] for field in SETUP_WEBHOOK_FIELDS if field in webhook})
+        
+        config_mgr = get_config_manager()
+        result = config_mgr.update_multiple(settings, updated_by='setup_wizard')
+        if result['errors']:
+            return jsonify({'error': 'Failed to save setup configuration'}), 500
+        
+        # Drop connections made with the old settings
+        reset_db_pool()
+        invalidate_db_status()
+        db_configured = check_database_configured()
+        
+        return jsonify({
+            'success': True,
+            'database_configured': db_configured,
+            'setup_complete': db_configured
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/setup/database', methods=['POST'])
 def setup_database():
-    """Save database configuration during setup"""
+    """Save database configuration during setup (superseded by /api/setup)"""
     try:
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
         # Validate required fields
-        required = ['db_host', 'db_port', 'db_name', 'db_user', 'db_password']
-        if not all(field in data for field in required):
+        if not all(field in data for field in SETUP_DATABASE_FIELDS):
             return jsonify({'error': 'Missing required fields'}), 400
         
         config_mgr = get_config_manager()
         
         # Save database configuration
-        config_mgr.set('db_host', data['db_host'], 'setup_wizard')
-        config_mgr.set('db_port', data['db_port'], 'setup_wizard')
-        config_mgr.set('db_name', data['db_name'], 'setup_wizard')
-        config_mgr.set('db_user', data['db_user'], 'setup_wizard')
-        config_mgr.set('db_password', data['db_password'], 'setup_wizard')
+        result = config_mgr.update_multiple(
+            {field: data[field] for field in SETUP_DATABASE_FIELDS},
+            updated_by='setup_wizard'
+        )
+        if result['errors']:
+            return jsonify({'error': 'Failed to save database configuration'}), 500
+        
+        # Drop connections made with the old settings
+        reset_db_pool()
+        invalidate_db_status()
         
         return jsonify({
             'success': True,
@@ -2165,7 +2846,7 @@ def setup_database():
 
 @app.route('/api/setup/webhook', methods=['POST'])
 def setup_webhook():
-    """Save webhook configuration during setup"""
+    """Save webhook configuration during setup (superseded by /api/setup)"""
     try:
         data = request.get_json()
         if not data:
@@ -2174,14 +2855,12 @@ def setup_webhook():
         config_mgr = get_config_manager()
         
         # Save webhook configuration
-        if 'results_publish_url' in data:
-            config_mgr.set('results_publish_url', data['results_publish_url'], 'setup_wizard')
-        if 'webhook_secret' in data:
-            config_mgr.set('webhook_secret', data['webhook_secret'], 'setup_wizard')
-        if 'webhook_timeout' in data:
-            config_mgr.set('webhook_timeout', data['webhook_timeout'], 'setup_wizard')
-        if 'webhook_retry_attempts' in data:
-            config_mgr.set('webhook_retry_attempts', data['webhook_retry_attempts'], 'setup_wizard')
+        result = config_mgr.update_multiple(
+            {field: data[field] for field in SETUP_WEBHOOK_FIELDS if field in data},
+            updated_by='setup_wizard'
+        )
+        if result['errors']:
+            return jsonify({'error': 'Failed to save webhook configuration'}), 500
         
         return jsonify({
             'success': True,
@@ -2210,10 +2889,9 @@ def setup_status():
 
 if __name__ == '__main__':
     # Initialize database
-    init_db()
+    init_app()
     
-    # Register shutdown handlers
-    atexit.register(shutdown_llrp_stations)
+    # Register shutdown signal handlers (atexit is registered at import)
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
@@ -2225,4 +2903,13 @@ if __name__ == '__main__':
     print(f"Results publishing site: {results_url}")
     print("="*60)
     
-    app.run(host='0.0.0.0', port=5001, debug=True, use_reloader=False)
+    # Debug mode (tracebacks in the browser, interactive debugger) is opt-in
+    # via FLASK_DEBUG=1. For production, serve the app with gunicorn instead:
+    #
+    #   gunicorn -w 1 -k gthread --threads 16 -b 0.0.0.0:5001 'web_app:init_app()'
+    #
+    # Keep a single worker: race controls, SSE subscribers and LLRP reader
+    # services all live in this process. Threads give the concurrency, and
+    # the atexit hook above stops the LLRP stations when the worker exits.
+    debug = os.getenv('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(host='0.0.0.0', port=5001, debug=debug, use_reloader=False, threaded=True)